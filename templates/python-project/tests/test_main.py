@@ -9,6 +9,8 @@ This module demonstrates best practices for writing unit tests including:
 - Proper use of mocking and assertions
 """
 
+import math
+import sys
 import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime
@@ -18,6 +20,10 @@ from src.main import (
     Config,
     ApplicationError,
     DataProcessor,
+    ProcessResult,
+    _PARALLEL_THRESHOLD,
+    _load_kernels,
+    _processed_timestamp,
     create_default_processor
 )
 
@@ -52,6 +58,14 @@ class TestConfig:
         assert config.timeout == 60.0
         assert config.created_at == custom_time
 
+    def test_config_uses_slots(self):
+        """Test that Config instances carry no per-instance __dict__."""
+        config = Config()
+
+        assert not hasattr(config, '__dict__')
+        with pytest.raises(AttributeError):
+            config.unknown_setting = True
+
     def test_config_post_init(self):
         """Test that __post_init__ sets created_at when None."""
         with patch('src.main.datetime') as mock_datetime:
@@ -108,6 +122,11 @@ class TestDataProcessor:
         """Provide a DataProcessor instance for testing."""
         return DataProcessor(config)
 
+    @pytest.fixture
+    def vectorized(self, monkeypatch):
+        """Route every batch, however small, through the vectorized path."""
+        monkeypatch.setattr('src.main._VECTOR_THRESHOLD', 1)
+
     def test_data_processor_initialization(self, config):
         """Test DataProcessor initialization with valid config."""
         processor = DataProcessor(config)
@@ -127,6 +146,7 @@ class TestDataProcessor:
 
         assert exc_info.value.error_code == "INVALID_INPUT"
         assert "cannot be empty" in exc_info.value.message
+        assert exc_info.value.details == {"items_length": 0}
 
     def test_process_items_none(self, processor):
         """Test processing None raises ApplicationError."""
@@ -140,24 +160,111 @@ class TestDataProcessor:
         items = [1, 2, 3, 4, 5]
         result = processor.process_items(items)
 
-        assert result['total'] == 15.0
-        assert result['count'] == 5
-        assert result['valid_items'] == [1.0, 2.0, 3.0, 4.0, 5.0]
-        assert result['errors'] == []
-        assert 'processed_timestamp' in result
+        assert result.total == 15.0
+        assert result.count == 5
+        assert result.valid_items == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert result.errors == []
+        assert result.processed_timestamp
+
+    def test_process_items_returns_process_result(self, processor):
+        """Test that results are ProcessResult tuples convertible to dicts."""
+        result = processor.process_items([1, "2"])
+
+        assert isinstance(result, ProcessResult)
+        as_dict = result.asdict()
+        assert type(as_dict) is dict
+        assert as_dict['total'] == 3.0
+        assert list(as_dict) == [
+            'total', 'count', 'valid_items', 'errors', 'processed_timestamp'
+        ]
+
+    def test_process_items_numeric_fast_path(self, processor, vectorized):
+        """Test that homogeneous int/float input matches per-item results."""
+        items = [1, 2.5, -3, 0.25]
+        result = processor.process_items(items)
+
+        assert result.total == 0.75
+        assert result.count == 4
+        assert result.valid_items == [1.0, 2.5, -3.0, 0.25]
+        assert all(type(value) is float for value in result.valid_items)
+        assert result.errors == []
+
+    def test_process_items_numeric_strings_fast_path(self, processor, vectorized):
+        """Test that numeric strings are converted on the vectorized path."""
+        result = processor.process_items(["1", 2, "3.5", 4.0])
+
+        assert result.total == 10.5
+        assert result.valid_items == [1.0, 2.0, 3.5, 4.0]
+        assert result.errors == []
+
+    def test_small_batches_skip_vectorized_path(self, processor):
+        """Test that batches below the threshold never build an array."""
+        with patch.object(DataProcessor, '_to_float_array') as mock_convert:
+            result = processor.process_items([1, 2, 3])
+
+        mock_convert.assert_not_called()
+        assert result.total == 6.0
+
+    def test_to_float_array_rejects_ineligible_items(self, processor):
+        """Test that the fast path defers bad strings and other types."""
+        assert processor._to_float_array([1, "invalid"]) is None
+        assert processor._to_float_array([1, b"2"]) is None
+        assert processor._to_float_array([1, True]) is None
+
+    def test_process_items_none_masked_on_fast_path(self, processor, vectorized):
+        """Test that None items are skipped by the masked reduction."""
+        values, mask = processor._to_float_array([1, None, "2.5", None])
+        assert mask.tolist() == [True, False, True, False]
+
+        result = processor.process_items([1, None, "2.5", None])
+
+        assert result.total == 3.5
+        assert result.count == 2
+        assert result.valid_items == [1.0, 2.5]
+        assert result.errors == []
+
+    def test_process_items_without_valid_items(self, processor, vectorized):
+        """Test that collect_valid=False keeps totals but skips the value list."""
+        fast = processor.process_items([1, 2, 3], collect_valid=False)
+        fallback = processor.process_items([1, "bad", None, 4], collect_valid=False)
+
+        assert fast.valid_items is None
+        assert (fast.total, fast.count) == (6.0, 3)
+        assert fallback.valid_items is None
+        assert (fallback.total, fallback.count) == (5.0, 2)
+        assert len(fallback.errors) == 1
+        assert processor.total_processed == 5
+
+    def test_process_items_total_is_correctly_rounded(self, processor):
+        """Test that the per-item path sums without accumulated rounding error."""
+        result = processor.process_items([0.1] * 10 + ["invalid"])
+
+        assert result.total == 1.0
+        assert len(result.errors) == 1
+
+    def test_process_items_overflow_and_infinities(self, processor):
+        """Test that totals fsum cannot represent fall back to plain addition."""
+        overflow = processor.process_items([1e308, 1e308])
+        infinities = processor.process_items(["inf", "-inf"])
+
+        assert overflow.total == math.inf
+        assert overflow.count == 2
+        assert math.isnan(infinities.total)
+        assert infinities.count == 2
+        assert infinities.errors == []
 
     def test_process_items_mixed_types(self, processor):
         """Test processing list with mixed valid and invalid types."""
         items = [1, "2", 3.5, "invalid", None]
         result = processor.process_items(items)
 
-        assert result['total'] == 6.5  # 1 + 2 + 3.5
-        assert result['count'] == 3
-        assert result['valid_items'] == [1.0, 2.0, 3.5]
-        assert len(result['errors']) == 1  # "invalid" should cause error
+        assert result.total == 6.5  # 1 + 2 + 3.5
+        assert result.count == 3
+        assert result.valid_items == [1.0, 2.0, 3.5]
+        assert len(result.errors) == 1  # "invalid" should cause error
 
         # Check error details
-        error = result['errors'][0]
+        error = result.errors[0]
         assert error['index'] == 3
         assert error['item'] == "invalid"
         assert "Cannot convert string" in error['error']
@@ -167,10 +274,10 @@ class TestDataProcessor:
         items = ["invalid1", "invalid2", object()]
         result = processor.process_items(items)
 
-        assert result['total'] == 0.0
-        assert result['count'] == 0
-        assert result['valid_items'] == []
-        assert len(result['errors']) == 3
+        assert result.total == 0.0
+        assert result.count == 0
+        assert result.valid_items == []
+        assert len(result.errors) == 3
 
     def test_process_single_item_numeric(self, processor):
         """Test _process_single_item with numeric values."""
@@ -180,6 +287,30 @@ class TestDataProcessor:
         assert processor._process_single_item("45.67") == 45.67
         assert processor._process_single_item(None) is None
 
+    @pytest.mark.parametrize("text", [
+        " 42 ", "-1.5e3", "1_000", ".5", "5.", "+inf", "-Infinity", "NaN",
+        "1__0", "1_", "e5", ".", "0x1f", "1.2.3", "", "   ",
+    ])
+    def test_process_single_item_string_matches_float(self, processor, text):
+        """Test that string pre-validation accepts exactly what float() does."""
+        try:
+            expected = float(text)
+        except ValueError:
+            with pytest.raises(ValueError, match="Cannot convert string"):
+                processor._process_single_item(text)
+        else:
+            assert processor._process_single_item(text) == pytest.approx(expected, nan_ok=True)
+
+    def test_process_single_item_subclasses(self, processor):
+        """Test that subclasses of supported types bypass the dispatch table."""
+        class Label(str):
+            pass
+
+        assert processor._process_single_item(True) == 1.0
+        assert processor._process_single_item(Label("2.5")) == 2.5
+        with pytest.raises(ValueError, match="Cannot convert string"):
+            processor._process_single_item(Label("nope"))
+
     def test_process_single_item_invalid_string(self, processor):
         """Test _process_single_item with invalid string."""
         with pytest.raises(ValueError, match="Cannot convert string"):
@@ -218,6 +349,30 @@ class TestDataProcessor:
         mock_logger.info.assert_called()
         mock_logger.warning.assert_called()  # Due to debug=True in config
 
+    @patch('src.main.logger')
+    def test_info_logging_skipped_when_disabled(self, mock_logger, processor):
+        """Test that INFO calls are skipped when the level is disabled."""
+        mock_logger.isEnabledFor.return_value = False
+
+        processor.process_items([1, 2, 3])
+
+        mock_logger.info.assert_not_called()
+
+
+class TestProcessedTimestamp:
+    """Test suite for the _processed_timestamp helper."""
+
+    def test_timestamp_reused_within_same_millisecond(self):
+        """Test that calls in the same millisecond format the clock once."""
+        fixed = datetime(2024, 1, 2, 3, 4, 5)
+        with patch('src.main.time.time_ns', return_value=123_456_000_000), \
+                patch('src.main._now', return_value=fixed) as mock_now:
+            first = _processed_timestamp()
+            second = _processed_timestamp()
+
+        assert first == second == fixed.isoformat()
+        mock_now.assert_called_once()
+
 
 class TestCreateDefaultProcessor:
     """Test suite for the create_default_processor factory function."""
@@ -263,14 +418,14 @@ class TestIntegration:
         result2 = processor.process_items(batch2)
 
         # Verify first batch results
-        assert result1['total'] == 15.5  # 1+2+3+4+5.5
-        assert result1['count'] == 5
-        assert len(result1['errors']) == 0
+        assert result1.total == 15.5  # 1+2+3+4+5.5
+        assert result1.count == 5
+        assert len(result1.errors) == 0
 
         # Verify second batch results
-        assert result2['total'] == 21.5  # 6+7+8.5
-        assert result2['count'] == 3
-        assert len(result2['errors']) == 1  # "invalid"
+        assert result2.total == 21.5  # 6+7+8.5
+        assert result2.count == 3
+        assert len(result2.errors) == 1  # "invalid"
 
         # Verify cumulative counter
         assert processor.total_processed == 8  # 5 + 3
@@ -286,9 +441,9 @@ class TestIntegration:
         result = processor.process_items(sample_data)
 
         # Verify expected results
-        assert result['total'] > 0
-        assert result['count'] > 0
-        assert len(result['errors']) > 0  # "invalid" should cause an error
+        assert result.total > 0
+        assert result.count > 0
+        assert len(result.errors) > 0  # "invalid" should cause an error
 
     def test_error_handling_chain(self):
         """Test error handling throughout the processing chain."""
@@ -300,9 +455,9 @@ class TestIntegration:
         result = processor.process_items(problematic_data)
 
         # Should handle all errors gracefully
-        assert result['total'] == 0.0
-        assert result['count'] == 0
-        assert len(result['errors']) == 3
+        assert result.total == 0.0
+        assert result.count == 0
+        assert len(result.errors) == 3
         assert processor.total_processed == 0
 
 
@@ -310,6 +465,17 @@ class TestIntegration:
 class TestPerformance:
     """Performance and stress tests."""
 
+    @pytest.fixture(params=["numba", "fallback"])
+    def kernels(self, request, monkeypatch):
+        """Sum with the numba kernels, then with the fallback used without numba."""
+        if request.param == "fallback":
+            monkeypatch.setitem(sys.modules, "numba", None)
+        else:
+            pytest.importorskip("numba")
+        _load_kernels.cache_clear()
+        yield request.param
+        _load_kernels.cache_clear()
+
     def test_large_dataset_processing(self):
         """Test processing performance with large dataset."""
         processor = create_default_processor()
@@ -319,9 +485,47 @@ class TestPerformance:
 
         result = processor.process_items(large_dataset)
 
-        assert result['count'] == 10000
-        assert result['total'] == sum(range(10000))
-        assert len(result['errors']) == 0
+        assert result.count == 10000
+        assert result.total == sum(range(10000))
+        assert len(result.errors) == 0
+
+    def test_parallel_dataset_processing(self):
+        """Test that batches above the parallel threshold sum correctly."""
+        processor = create_default_processor()
+        size = _PARALLEL_THRESHOLD + 1
+
+        result = processor.process_items(list(range(size)), collect_valid=False)
+
+        assert result.count == size
+        assert result.total == sum(range(size))
+
+    @pytest.mark.parametrize("items", [
+        [0.1] * 10000,
+        [0.1] * 1000 + [None],
+        [0.1] * (_PARALLEL_THRESHOLD + 1),
+        [0.1] * _PARALLEL_THRESHOLD + [None],
+    ])
+    def test_vectorized_totals_are_compensated(self, kernels, items):
+        """Test that every array path sums as precisely as the per-item path."""
+        processor = create_default_processor()
+        values = [item for item in items if item is not None]
+
+        result = processor.process_items(items, collect_valid=False)
+
+        assert result.count == len(values)
+        assert result.total == math.fsum(values)
+
+    @pytest.mark.filterwarnings("error")
+    @pytest.mark.parametrize("size", [1500, _PARALLEL_THRESHOLD + 1])
+    def test_vectorized_totals_keep_infinities(self, kernels, size):
+        """Test that compensation does not turn inf or overflow into nan."""
+        processor = create_default_processor()
+
+        infinite = processor.process_items([math.inf] + [1.0] * (size - 1))
+        overflow = processor.process_items([1e308] * size)
+
+        assert infinite.total == math.inf
+        assert overflow.total == math.inf
 
     def test_mixed_large_dataset(self):
         """Test processing performance with large mixed dataset."""
@@ -337,8 +541,8 @@ class TestPerformance:
 
         result = processor.process_items(mixed_dataset)
 
-        assert result['count'] == 990  # 1000 - 10 invalid
-        assert len(result['errors']) == 10
+        assert result.count == 990  # 1000 - 10 invalid
+        assert len(result.errors) == 10
         assert processor.total_processed == 990
 
 
@@ -36,11 +36,11 @@ def list_messages(
     chat_jid: Optional[str] = None,
     query: Optional[str] = None,
     limit: int = 20,
-    page: int = 0,
     include_context: bool = True,
     context_before: int = 1,
-    context_after: int = 1
-) -> List[Dict[str, Any]]:
+    context_after: int = 1,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
     """Get WhatsApp messages matching specified criteria with optional context.
 
     Args:
@@ -50,44 +50,49 @@ def list_messages(
         chat_jid: Optional chat JID to filter messages by chat
         query: Optional search term to filter messages by content
         limit: Maximum number of messages to return (default 20)
-        page: Page number for pagination (default 0)
         include_context: Whether to include messages before and after matches (default True)
         context_before: Number of messages to include before each match (default 1)
         context_after: Number of messages to include after each match (default 1)
+        cursor: Optional next_cursor from a previous call; fetches the following page.
+            Pages are walked in order; there is no jumping to a page number
+
+    Returns:
+        {"data": formatted messages, "next_cursor": ..., "has_more": ...}
     """
-    messages = whatsapp_list_messages(
+    return whatsapp_list_messages(
         after=after,
         before=before,
         sender_phone_number=sender_phone_number,
         chat_jid=chat_jid,
         query=query,
         limit=limit,
-        page=page,
         include_context=include_context,
         context_before=context_before,
-        context_after=context_after
+        context_after=context_after,
+        cursor=cursor
     )
-    return messages
 
 @mcp.tool()
 def list_chats(
     query: Optional[str] = None,
     limit: int = 20,
-    page: int = 0,
     include_last_message: bool = True,
-    sort_by: str = "last_active"
-) -> List[Dict[str, Any]]:
+    sort_by: str = "last_active",
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
     """Get WhatsApp chats matching specified criteria.
 
     Args:
         query: Optional search term to filter chats by name
         limit: Maximum number of chats to return (default 20)
-        page: Page number for pagination (default 0)
         include_last_message: Whether to include the last message for each chat (default True)
-        sort_by: How to sort the chats (default "last_active")
+        sort_by: How to sort the chats, "last_active" or "name" (default "last_active")
+        cursor: Optional next_cursor from a previous call; fetches the following page
+
+    Returns:
+        {"data": chats, "next_cursor": ..., "has_more": ...}
     """
-    chats = whatsapp_list_chats(query, limit, page, include_last_message, sort_by)
-    return chats
+    return whatsapp_list_chats(query, limit, include_last_message, sort_by, cursor)
 
 @mcp.tool()
 def get_chat(chat_jid: str, include_last_message: bool = True) -> Dict[str, Any]:
@@ -111,16 +116,18 @@ def get_direct_chat_by_contact(sender_phone_number: str) -> Dict[str, Any]:
     return chat
 
 @mcp.tool()
-def get_contact_chats(jid: str, limit: int = 20, page: int = 0) -> List[Dict[str, Any]]:
+def get_contact_chats(jid: str, limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
     """Get WhatsApp chats involving a specific contact.
 
     Args:
         jid: The JID of the contact
         limit: Maximum number of chats to return (default 20)
-        page: Page number for pagination (default 0)
+        cursor: Optional next_cursor from a previous call; fetches the following page
+
+    Returns:
+        {"data": chats, "next_cursor": ..., "has_more": ...}
     """
-    chats = whatsapp_get_contact_chats(jid, limit, page)
-    return chats
+    return whatsapp_get_contact_chats(jid, limit, cursor)
 
 @mcp.tool()
 def get_last_interaction(jid: str) -> str:
@@ -8,11 +8,15 @@ the WhatsApp Web API.
 """
 
 import asyncio
+import functools
 import logging
+import os
 import sqlite3
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 from datetime import datetime
 
 import mcp.types as types
@@ -33,19 +37,59 @@ MESSAGES_DB_PATH = BRIDGE_PATH / "store" / "messages.db"
 class WhatsAppBridge:
     """Interface to communicate with the WhatsApp bridge."""
     
+    _MESSAGE_COLUMNS = ("id", "chat_jid", "sender", "content", "timestamp", "is_from_me", "media_type", "filename")
+    
+    # Fixed statement text so sqlite3's statement cache reuses the plan;
+    # naming the columns also keeps media BLOBs out of the result.
+    _RECENT_SQL = f"""
+        SELECT {", ".join(_MESSAGE_COLUMNS)}
+        FROM messages
+        ORDER BY timestamp DESC
+        LIMIT ?
+    """
+    
     def __init__(self):
         self.db_path = DB_PATH
         self.messages_db_path = MESSAGES_DB_PATH
+        self._connections: Dict[Path, sqlite3.Connection] = {}
+        # Connections are shared across FastMCP worker threads
+        self._lock = threading.Lock()
+    
+    def get_connection(self, db_path: Optional[Path] = None) -> Optional[sqlite3.Connection]:
+        """Get the persistent connection for a database, opening it on first use."""
+        db_path = db_path or self.db_path
+        with self._lock:
+            conn = self._connections.get(db_path)
+            if conn is not None:
+                return conn
+            
+            try:
+                if db_path.exists():
+                    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+                    # WAL lets our reads proceed while the bridge writes
+                    try:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                    except sqlite3.OperationalError:
+                        # Needs an exclusive lock the bridge may hold; the mode
+                        # is persistent, so a later connection will set it
+                        pass
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    if db_path == self.messages_db_path:
+                        self._ensure_message_indexes(conn)
+                    self._connections[db_path] = conn
+                    return conn
+                return None
+            except Exception as e:
+                logger.error(f"Failed to connect to database: {e}")
+                return None
     
-    def get_connection(self) -> Optional[sqlite3.Connection]:
-        """Get database connection."""
+    def _ensure_message_indexes(self, conn: sqlite3.Connection) -> None:
+        """Create the indexes the message queries rely on, if missing."""
         try:
-            if self.db_path.exists():
-                return sqlite3.connect(str(self.db_path))
-            return None
-        except Exception as e:
-            logger.error(f"Failed to connect to database: {e}")
-            return None
+            # Serve ORDER BY timestamp DESC from an index scan instead of a sort
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_ts ON messages(timestamp DESC)")
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to create message indexes: {e}")
     
     def get_contacts(self) -> List[Dict[str, Any]]:
         """Get list of WhatsApp contacts."""
@@ -54,38 +98,40 @@ class WhatsAppBridge:
             return []
         
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM contacts LIMIT 50")
-            columns = [description[0] for description in cursor.description]
-            contacts = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            return contacts
+            with self._lock:
+                cursor = conn.execute("SELECT * FROM contacts LIMIT 50")
+                # Read per query, so the keys follow the table's current
+                # columns even if the bridge alters it
+                columns = [column[0] for column in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Failed to get contacts: {e}")
             return []
-        finally:
-            conn.close()
     
-    def get_recent_messages(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """Get recent messages."""
-        conn = sqlite3.connect(str(self.messages_db_path)) if self.messages_db_path.exists() else None
+    def iter_recent_messages(self, limit: int = 20, batch_size: int = 256) -> Iterator[Dict[str, Any]]:
+        """Yield recent messages one at a time, fetching rows in batches."""
+        conn = self.get_connection(self.messages_db_path)
         if not conn:
-            return []
+            return
         
+        # The lock is held per batch, never across a yield
+        with self._lock:
+            cursor = conn.execute(self._RECENT_SQL, (limit,))
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            columns = self._MESSAGE_COLUMNS
+            yield from (dict(zip(columns, row)) for row in rows)
+    
+    def get_recent_messages(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get recent messages."""
         try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM messages 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, (limit,))
-            columns = [description[0] for description in cursor.description]
-            messages = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            return messages
+            return list(self.iter_recent_messages(limit))
         except Exception as e:
             logger.error(f"Failed to get messages: {e}")
             return []
-        finally:
-            conn.close()
     
     def send_message(self, phone_number: str, message: str) -> Dict[str, Any]:
         """Send a WhatsApp message."""
@@ -108,6 +154,31 @@ class WhatsAppBridge:
 # Initialize WhatsApp bridge
 whatsapp = WhatsAppBridge()
 
+def ttl_cache(seconds: float):
+    """Cache the result of a zero-argument function for the given number of seconds."""
+    def decorator(func):
+        last_time: Optional[float] = None
+        last_value: Any = None
+        
+        @functools.wraps(func)
+        def wrapper():
+            nonlocal last_time, last_value
+            now = time.monotonic()
+            if last_time is None or now - last_time >= seconds:
+                last_value = func()
+                last_time = now
+            return last_value
+        return wrapper
+    return decorator
+
+def _dir_entries(path: Path) -> set:
+    """Return the names in a directory, or an empty set if it does not exist."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
 @mcp.tool()
 def get_whatsapp_contacts() -> List[Dict[str, Any]]:
     """
@@ -153,6 +224,7 @@ def send_whatsapp_message(phone_number: str, message: str) -> Dict[str, Any]:
     return whatsapp.send_message(phone_number, message)
 
 @mcp.tool()
+@ttl_cache(seconds=1)
 def get_whatsapp_status() -> Dict[str, Any]:
     """
     Get the current status of the WhatsApp bridge connection.
@@ -160,9 +232,12 @@ def get_whatsapp_status() -> Dict[str, Any]:
     Returns:
         Dictionary with connection status and bridge information.
     """
-    bridge_exists = (BRIDGE_PATH / "whatsapp-bridge.exe").exists()
-    db_exists = DB_PATH.exists()
-    messages_db_exists = MESSAGES_DB_PATH.exists()
+    # One directory listing per folder instead of a stat per file;
+    # rapid status polls within a second reuse the previous result.
+    store_files = _dir_entries(DB_PATH.parent)
+    bridge_exists = "whatsapp-bridge.exe" in _dir_entries(BRIDGE_PATH)
+    db_exists = DB_PATH.name in store_files
+    messages_db_exists = MESSAGES_DB_PATH.name in store_files
     
     status = {
         "bridge_executable": bridge_exists,
@@ -0,0 +1,143 @@
+"""
+Tests for WhatsAppBridge in main_old.py, run against temporary databases.
+"""
+
+import sqlite3
+
+import pytest
+
+import main_old
+from main_old import WhatsAppBridge, ttl_cache
+
+
+@pytest.fixture
+def bridge(tmp_path):
+    """Provide a WhatsAppBridge over fresh contacts and messages databases."""
+    contacts_path = tmp_path / "whatsapp.db"
+    conn = sqlite3.connect(contacts_path)
+    conn.execute("CREATE TABLE contacts (jid TEXT, phone_number TEXT, name TEXT)")
+    conn.executemany("INSERT INTO contacts VALUES (?, ?, ?)", [
+        ("100@s.whatsapp.net", "100", "Alice"),
+        ("101@s.whatsapp.net", "101", "Bob"),
+    ])
+    conn.commit()
+    conn.close()
+
+    messages_path = tmp_path / "messages.db"
+    conn = sqlite3.connect(messages_path)
+    conn.execute("""
+        CREATE TABLE messages (
+            id TEXT, chat_jid TEXT, sender TEXT, content TEXT, timestamp TIMESTAMP,
+            is_from_me BOOLEAN, media_type TEXT, filename TEXT, media_key BLOB
+        )
+    """)
+    conn.executemany("INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+        (f"M{i}", "100@s.whatsapp.net", "100", f"msg {i}",
+         f"2024-03-01 10:00:{i:02d}+00:00", i % 2, None, None, b"\0" * 8)
+        for i in range(30)
+    ])
+    conn.commit()
+    conn.close()
+
+    bridge = WhatsAppBridge()
+    bridge.db_path = contacts_path
+    bridge.messages_db_path = messages_path
+    yield bridge
+    for conn in bridge._connections.values():
+        conn.close()
+
+
+class TestWhatsAppBridge:
+    """Test suite for the WhatsAppBridge database helpers."""
+
+    def test_connections_are_reused_in_wal_mode(self, bridge):
+        """Test that each database gets one persistent WAL connection."""
+        conn = bridge.get_connection()
+
+        assert bridge.get_connection() is conn
+        assert bridge.get_connection(bridge.messages_db_path) is not conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_missing_database_gives_no_connection(self, bridge, tmp_path):
+        """Test that a database that does not exist yet is not created."""
+        bridge.db_path = tmp_path / "missing.db"
+
+        assert bridge.get_connection() is None
+        assert bridge.get_contacts() == []
+        assert not bridge.db_path.exists()
+
+    def test_get_contacts(self, bridge):
+        """Test that contacts come back keyed by column name."""
+        assert bridge.get_contacts() == [
+            {"jid": "100@s.whatsapp.net", "phone_number": "100", "name": "Alice"},
+            {"jid": "101@s.whatsapp.net", "phone_number": "101", "name": "Bob"},
+        ]
+
+    def test_get_contacts_follows_schema_changes(self, bridge):
+        """Test that keys follow a renamed column on an open connection."""
+        bridge.get_contacts()
+        conn = sqlite3.connect(bridge.db_path)
+        conn.execute("ALTER TABLE contacts RENAME COLUMN name TO full_name")
+        conn.commit()
+        conn.close()
+
+        assert bridge.get_contacts()[0] == {
+            "jid": "100@s.whatsapp.net", "phone_number": "100", "full_name": "Alice"
+        }
+
+    def test_get_contacts_before_table_exists(self, bridge):
+        """Test that contacts created after the connection opened are read correctly."""
+        conn = sqlite3.connect(bridge.db_path)
+        conn.execute("ALTER TABLE contacts RENAME TO contacts_later")
+        conn.commit()
+
+        assert bridge.get_contacts() == []
+
+        conn.execute("ALTER TABLE contacts_later RENAME TO contacts")
+        conn.commit()
+        conn.close()
+
+        assert bridge.get_contacts()[1]["name"] == "Bob"
+
+    def test_get_recent_messages(self, bridge):
+        """Test that recent messages are newest first, limited and free of BLOBs."""
+        messages = bridge.get_recent_messages(limit=3)
+
+        assert [message["id"] for message in messages] == ["M29", "M28", "M27"]
+        assert tuple(messages[0]) == WhatsAppBridge._MESSAGE_COLUMNS
+        assert "media_key" not in messages[0]
+
+    def test_iter_recent_messages_across_batches(self, bridge):
+        """Test that fetching in small batches yields every row once, in order."""
+        ids = [message["id"] for message in bridge.iter_recent_messages(limit=25, batch_size=4)]
+
+        assert ids == [f"M{i}" for i in range(29, 4, -1)]
+
+    def test_timestamp_index_is_created(self, bridge):
+        """Test that opening the messages database adds the timestamp index."""
+        conn = bridge.get_connection(bridge.messages_db_path)
+
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_messages_ts" in names
+
+
+class TestTtlCache:
+    """Test suite for the ttl_cache decorator."""
+
+    def test_result_reused_until_expiry(self, monkeypatch):
+        """Test that calls within the TTL reuse the result and later calls refresh it."""
+        now = [100.0]
+        monkeypatch.setattr(main_old.time, "monotonic", lambda: now[0])
+        calls = []
+
+        @ttl_cache(seconds=1)
+        def status():
+            calls.append(now[0])
+            return len(calls)
+
+        assert status() == 1
+        now[0] += 0.5
+        assert status() == 1
+        now[0] += 0.5
+        assert status() == 2
+        assert calls == [100.0, 101.0]
@@ -0,0 +1,187 @@
+"""
+Tests for the bridge API and audio helpers in whatsapp.py, with HTTP and
+ffmpeg mocked out.
+"""
+
+import os
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+import whatsapp
+
+
+def _staggered(results):
+    """Wrap a send function so earlier recipients finish last."""
+    def send(recipient, *args):
+        time.sleep(0.01 * (5 - int(recipient[-1])))
+        return results(recipient)
+    return send
+
+
+class TestAudioConversion:
+    """Test suite for the cached audio conversion."""
+
+    @pytest.fixture
+    def converter(self, tmp_path, monkeypatch):
+        """Replace ffmpeg with a mock writing a new temp .ogg per call."""
+        outputs = iter(range(1000))
+
+        def convert(path):
+            output = tmp_path / f"converted-{next(outputs)}.ogg"
+            output.write_bytes(b"OggS")
+            return str(output)
+
+        mock_convert = Mock(side_effect=convert)
+        monkeypatch.setattr(whatsapp.audio, "convert_to_opus_ogg_temp", mock_convert)
+        whatsapp._convert_audio_cached.cache_clear()
+        yield mock_convert
+        whatsapp._convert_audio_cached.cache_clear()
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        """Provide an audio file to convert."""
+        path = tmp_path / "voice.mp3"
+        path.write_bytes(b"ID3" + b"\0" * 64)
+        return path
+
+    def test_unchanged_file_is_converted_once(self, converter, source):
+        """Test that resending an unchanged file reuses the conversion."""
+        first = whatsapp._convert_audio(str(source))
+        second = whatsapp._convert_audio(str(source))
+
+        assert first == second
+        converter.assert_called_once_with(os.path.abspath(source))
+
+    def test_new_mtime_converts_again(self, converter, source):
+        """Test that touching the file invalidates its conversion."""
+        first = whatsapp._convert_audio(str(source))
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        second = whatsapp._convert_audio(str(source))
+
+        assert first != second
+        assert converter.call_count == 2
+
+    def test_new_size_converts_again(self, converter, source):
+        """Test that a file of a different size is converted again, even with the old mtime."""
+        first = whatsapp._convert_audio(str(source))
+        stat = source.stat()
+        with open(source, "ab") as f:
+            f.write(b"more")
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        second = whatsapp._convert_audio(str(source))
+
+        assert first != second
+        assert converter.call_count == 2
+
+    def test_deleted_output_converts_again(self, converter, source):
+        """Test that a cleaned-up temp output is replaced by a new conversion."""
+        first = whatsapp._convert_audio(str(source))
+        os.remove(first)
+
+        second = whatsapp._convert_audio(str(source))
+
+        assert os.path.isfile(second)
+        assert converter.call_count == 2
+
+    def test_send_audio_message_many_keeps_recipient_order(self, converter, source, tmp_path, monkeypatch):
+        """Test that a voice note is converted once and results follow recipient order."""
+        send_file = Mock(side_effect=_staggered(lambda recipient: (True, f"sent to {recipient}")))
+        monkeypatch.setattr(whatsapp, "send_file", send_file)
+        recipients = ["r1", "r2", "r3", "r4"]
+
+        results = whatsapp.send_audio_message_many(recipients, str(source))
+
+        assert results == [(True, f"sent to {recipient}") for recipient in recipients]
+        converter.assert_called_once()
+        assert {call.args[1] for call in send_file.call_args_list} == {str(tmp_path / "converted-0.ogg")}
+
+    def test_send_audio_message_many_missing_file(self, converter, tmp_path):
+        """Test that a missing file fails every recipient without converting."""
+        results = whatsapp.send_audio_message_many(["r1", "r2"], str(tmp_path / "missing.mp3"))
+
+        assert [success for success, _ in results] == [False, False]
+        converter.assert_not_called()
+
+
+class TestPostJson:
+    """Test suite for the shared bridge POST helper."""
+
+    @pytest.fixture
+    def post(self, monkeypatch):
+        """Replace the keep-alive session's post with a mock."""
+        mock_post = Mock()
+        monkeypatch.setattr(whatsapp._SESSION, "post", mock_post)
+        return mock_post
+
+    def test_network_error(self, post):
+        """Test that a failed request is reported as a request error."""
+        post.side_effect = requests.ConnectionError("connection refused")
+
+        assert whatsapp._post_json(whatsapp._SEND_URL, {}) == (None, "Request error: connection refused")
+
+    def test_non_200_status(self, post):
+        """Test that an error status is reported with the body text."""
+        post.return_value = Mock(status_code=500, text="bridge down")
+
+        assert whatsapp._post_json(whatsapp._SEND_URL, {}) == (None, "Error: HTTP 500 - bridge down")
+
+    def test_non_json_body(self, post):
+        """Test that a 200 reply that is not JSON is reported as a parse error."""
+        post.return_value = Mock(status_code=200, content=b"<html>", text="<html>")
+
+        assert whatsapp._post_json(whatsapp._SEND_URL, {}) == (None, "Error parsing response: <html>")
+
+    def test_json_body(self, post):
+        """Test that a JSON reply is decoded and the request sent as JSON."""
+        post.return_value = Mock(status_code=200, content=b'{"success": true, "message": "Sent"}')
+
+        result = whatsapp._post_json(whatsapp._SEND_URL, {"recipient": "r1"})
+
+        assert result == ({"success": True, "message": "Sent"}, "")
+        post.assert_called_once_with(
+            whatsapp._SEND_URL, json={"recipient": "r1"}, timeout=whatsapp._REQUEST_TIMEOUT
+        )
+
+    def test_download_uses_longer_timeout(self, post):
+        """Test that download_media returns the path with the download timeout."""
+        post.return_value = Mock(status_code=200, content=b'{"success": true, "path": "/tmp/m.jpg"}')
+
+        assert whatsapp.download_media("M1", "100@s.whatsapp.net") == "/tmp/m.jpg"
+        assert post.call_args.kwargs["timeout"] == whatsapp._DOWNLOAD_TIMEOUT
+
+    def test_send_message_reports_errors(self, post):
+        """Test that send_message passes the helper's error text through."""
+        post.return_value = Mock(status_code=200, content=b"not json", text="not json")
+
+        assert whatsapp.send_message("r1", "hi") == (False, "Error parsing response: not json")
+
+
+class TestSendMany:
+    """Test suite for the concurrent multi-recipient send."""
+
+    def test_results_follow_recipient_order(self, monkeypatch):
+        """Test that results come back in recipient order, not completion order."""
+        send_message = Mock(side_effect=_staggered(lambda recipient: (recipient != "r2", f"to {recipient}")))
+        monkeypatch.setattr(whatsapp, "send_message", send_message)
+        recipients = ["r1", "r2", "r3", "r4"]
+
+        results = whatsapp.send_message_many(recipients, "hello")
+
+        assert results == [(True, "to r1"), (False, "to r2"), (True, "to r3"), (True, "to r4")]
+        assert sorted(call.args for call in send_message.call_args_list) == [
+            (recipient, "hello") for recipient in recipients
+        ]
+
+    def test_empty_recipients(self, monkeypatch):
+        """Test that no recipients means no sends and no results."""
+        send_message = Mock()
+        monkeypatch.setattr(whatsapp, "send_message", send_message)
+
+        assert whatsapp.send_message_many([], "hello") == []
+        send_message.assert_not_called()
@@ -0,0 +1,460 @@
+"""
+Tests for the SQLite queries in whatsapp.py, run against a small fixture
+database shaped like the bridge's store.
+"""
+
+import os
+import queue
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+
+import whatsapp
+
+
+CHATS = [
+    ("100@s.whatsapp.net", "Alice", "2024-03-01 10:00:05+00:00"),
+    ("101@s.whatsapp.net", "Bob", "2024-03-01 10:00:05+00:00"),
+    ("102@s.whatsapp.net", None, "2024-02-11 08:30:00+00:00"),
+    ("103@s.whatsapp.net", None, None),
+    ("200@g.us", "Group", "2024-03-02 12:00:00+00:00"),
+    ("201@g.us", "Alice", None),
+    ("202@g.us", None, "2024-03-02 12:00:00+00:00"),
+]
+
+CONTACTS = [
+    ("100@s.whatsapp.net", "100", "Alice"),
+    ("101@s.whatsapp.net", "101", "Bob"),
+]
+
+
+def _message_rows():
+    """60 messages over three chats, with runs sharing one timestamp."""
+    chat_jids = ["100@s.whatsapp.net", "101@s.whatsapp.net", "200@g.us"]
+    rows = []
+    for i in range(60):
+        # Every third message repeats the previous second
+        second = i - (i % 3 == 2)
+        timestamp = f"2024-03-01 10:{second // 60:02d}:{second % 60:02d}+00:00"
+        chat_jid = chat_jids[i % 3 if i < 45 else 0]
+        sender = chat_jid.split("@")[0] if chat_jid.endswith("@s.whatsapp.net") else "101"
+        rows.append((f"M{i:03d}", chat_jid, sender, f"msg {i}", timestamp, i % 4 == 0, None))
+    return rows
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Point whatsapp at a fresh fixture database with an empty pool."""
+    path = tmp_path / "messages.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE chats (
+            jid TEXT PRIMARY KEY, name TEXT, last_message_time TIMESTAMP,
+            last_message TEXT, last_sender TEXT, last_is_from_me BOOLEAN
+        );
+        CREATE TABLE messages (
+            id TEXT, chat_jid TEXT, sender TEXT, content TEXT,
+            timestamp TIMESTAMP, is_from_me BOOLEAN, media_type TEXT,
+            PRIMARY KEY (id, chat_jid)
+        );
+        CREATE TABLE contacts (jid TEXT, phone_number TEXT, name TEXT);
+    """)
+    conn.executemany("INSERT INTO chats (jid, name, last_message_time) VALUES (?, ?, ?)", CHATS)
+    conn.executemany("INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)", _message_rows())
+    conn.executemany("INSERT INTO contacts VALUES (?, ?, ?)", CONTACTS)
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(whatsapp, "MESSAGES_DB_PATH", str(path))
+    monkeypatch.setattr(whatsapp, "_POOL", queue.Queue(maxsize=whatsapp._POOL_SIZE))
+    monkeypatch.setattr(whatsapp, "_indexes_created", False)
+    whatsapp.clear_contact_cache()
+    yield path
+    while not whatsapp._POOL.empty():
+        whatsapp._POOL.get_nowait().close()
+    whatsapp.clear_contact_cache()
+
+
+@pytest.fixture
+def local_zone():
+    """Switch the process's local zone for one test; returns the setter."""
+    saved = os.environ.get("TZ")
+
+    def set_zone(zone):
+        os.environ["TZ"] = zone
+        time.tzset()
+
+    yield set_zone
+    if saved is None:
+        os.environ.pop("TZ", None)
+    else:
+        os.environ["TZ"] = saved
+    time.tzset()
+
+
+def _insert_messages(db, rows):
+    """Add (id, chat_jid, sender, content, timestamp, is_from_me) rows to the fixture."""
+    conn = sqlite3.connect(db)
+    conn.executemany("INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?, NULL)", rows)
+    conn.commit()
+    conn.close()
+
+
+def _walk(fetch, limit, count=len):
+    """Call fetch(cursor) page by page, checking has_more; return all data.
+
+    ``count`` gives the number of rows in a page's data.
+    """
+    pages = []
+    cursor = None
+    while True:
+        page = fetch(cursor)
+        assert page["has_more"] is (page["next_cursor"] is not None)
+        pages.append(page["data"])
+        if not page["has_more"]:
+            return pages
+        assert count(page["data"]) == limit
+        cursor = page["next_cursor"]
+
+
+def _contents(formatted):
+    """Message contents from list_messages output, in order."""
+    return [line.rsplit(" : ", 1)[1] for line in formatted.splitlines()]
+
+
+class TestCursors:
+    """Test suite for cursor encoding and keyset clauses."""
+
+    @pytest.mark.parametrize("key, tiebreak", [
+        (1709287205, "M001"),
+        ("2024-03-01 10:00:05+00:00", "100@s.whatsapp.net"),
+        ("Alice", "201@g.us"),
+        (None, "103@s.whatsapp.net"),
+    ])
+    def test_cursor_round_trip(self, key, tiebreak):
+        """Test that a decoded cursor returns the encoded key and tiebreak."""
+        cursor = whatsapp._encode_cursor(key, tiebreak)
+
+        assert whatsapp._decode_cursor(cursor) == (key, tiebreak)
+
+    @pytest.mark.parametrize("cursor", [
+        "not a cursor",
+        "e30=",  # {}
+        "WzEsMiwzXQ==",  # [1,2,3]
+        "__8=",  # not UTF-8
+    ])
+    def test_invalid_cursor_raises_value_error(self, cursor):
+        """Test that malformed cursors are rejected with ValueError."""
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            whatsapp._decode_cursor(cursor)
+
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_keyset_sql_matches_sort_order(self, descending):
+        """Test that the keyset clause selects exactly the rows after each row."""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (k TEXT, id TEXT)")
+        conn.executemany("INSERT INTO t VALUES (?, ?)", [
+            (None, "a"), ("x", "b"), (None, "c"), ("x", "d"), ("y", "e"), ("w", "f"), (None, "g"),
+        ])
+        direction = "DESC" if descending else "ASC"
+        order_by = f" ORDER BY k {direction}, id {direction}"
+        ordered = conn.execute("SELECT k, id FROM t" + order_by).fetchall()
+
+        for position, (key, tiebreak) in enumerate(ordered):
+            clause, params = whatsapp._keyset_clause("k", descending, "id", key, tiebreak)
+            rows = conn.execute(f"SELECT k, id FROM t WHERE {clause}" + order_by, params).fetchall()
+
+            assert rows == ordered[position + 1:]
+
+
+class TestListChats:
+    """Test suite for paging through list_chats."""
+
+    @pytest.mark.parametrize("sort_by", ["last_active", "name"])
+    @pytest.mark.parametrize("limit", [1, 2, 3, 7])
+    def test_pages_cover_every_chat_once(self, db, sort_by, limit):
+        """Test that walking all pages yields each chat exactly once, in order."""
+        pages = _walk(lambda cursor: whatsapp.list_chats(limit=limit, sort_by=sort_by, cursor=cursor), limit)
+        jids = [chat.jid for page in pages for chat in page]
+
+        unpaged = whatsapp.list_chats(limit=len(CHATS), sort_by=sort_by)
+        assert unpaged["has_more"] is False
+        assert jids == [chat.jid for chat in unpaged["data"]]
+        assert sorted(jids) == sorted(jid for jid, _, _ in CHATS)
+
+    def test_exact_fit_has_no_more(self, db):
+        """Test that a page holding the last chat reports has_more False."""
+        page = whatsapp.list_chats(limit=len(CHATS))
+
+        assert len(page["data"]) == len(CHATS)
+        assert page == {"data": page["data"], "next_cursor": None, "has_more": False}
+
+    def test_invalid_cursor_raises_value_error(self, db):
+        """Test that list_chats rejects a malformed cursor."""
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            whatsapp.list_chats(cursor="not a cursor")
+
+    def test_invalid_sort_by_raises_value_error(self, db):
+        """Test that an unknown sort_by is rejected, naming the accepted values."""
+        with pytest.raises(ValueError, match="Invalid sort_by: 'newest'. Use one of: last_active, name"):
+            whatsapp.list_chats(sort_by="newest")
+
+    def test_contact_chats_pages_cover_every_chat_once(self, db):
+        """Test that get_contact_chats pages through each chat exactly once."""
+        pages = _walk(lambda cursor: whatsapp.get_contact_chats("101", limit=1, cursor=cursor), 1)
+        jids = [chat.jid for page in pages for chat in page]
+
+        assert sorted(jids) == ["101@s.whatsapp.net", "200@g.us"]
+
+
+class TestListMessages:
+    """Test suite for paging through list_messages."""
+
+    @pytest.mark.parametrize("limit", [1, 7, 20, 60])
+    def test_pages_cover_every_message_once(self, db, limit):
+        """Test that walking all pages yields each message exactly once, newest first."""
+        pages = _walk(
+            lambda cursor: whatsapp.list_messages(limit=limit, include_context=False, cursor=cursor),
+            limit,
+            lambda data: len(_contents(data))
+        )
+        contents = [content for page in pages for content in _contents(page)]
+
+        expected = [row[3] for row in sorted(_message_rows(), key=lambda row: (row[4], row[0]), reverse=True)]
+        assert contents == expected
+
+    def test_filtered_pages_cover_every_message_once(self, db):
+        """Test that paging keeps filters and covers the filtered rows once."""
+        pages = _walk(
+            lambda cursor: whatsapp.list_messages(
+                chat_jid="100@s.whatsapp.net", limit=4, include_context=False, cursor=cursor
+            ),
+            4,
+            lambda data: len(_contents(data))
+        )
+        contents = [content for page in pages for content in _contents(page)]
+
+        expected = {row[3] for row in _message_rows() if row[1] == "100@s.whatsapp.net"}
+        assert len(contents) == len(expected)
+        assert set(contents) == expected
+
+    def test_all_filters_bind_in_flag_order(self, db):
+        """Test that after, before, sender, chat, query and cursor combine correctly."""
+        after, before = "2024-03-01T10:00:43+00:00", "2024-03-01T10:00:49+00:00"
+        pages = _walk(
+            lambda cursor: whatsapp.list_messages(
+                after=after, before=before, sender_phone_number="100",
+                chat_jid="100@s.whatsapp.net", query="MSG 4",
+                limit=1, include_context=False, cursor=cursor
+            ),
+            1,
+            lambda data: len(_contents(data))
+        )
+        contents = [content for page in pages for content in _contents(page)]
+
+        lower, upper = datetime.fromisoformat(after), datetime.fromisoformat(before)
+        expected = [
+            row[3] for row in sorted(_message_rows(), key=lambda row: (row[4], row[0]), reverse=True)
+            if lower < datetime.fromisoformat(row[4]) < upper
+            and row[2] == "100" and row[1] == "100@s.whatsapp.net" and "msg 4" in row[3]
+        ]
+        assert expected == ["msg 48", "msg 47", "msg 46", "msg 45"]
+        assert contents == expected
+
+    @pytest.mark.parametrize("has_chat, params, expected", [
+        (False, (1709287205, 1709287205, "M010", 5), "USING INDEX ix_msg_ts_id (<expr><?)"),
+        (True, ("100@s.whatsapp.net", 1709287205, 1709287205, "M010", 5),
+         "USING INDEX ix_msg_chat_ts_id (chat_jid=? AND <expr><?)"),
+    ])
+    def test_cursor_seeks_the_index(self, db, has_chat, params, expected):
+        """Test that a cursor page starts with a range seek, not a scan from the top."""
+        query_sql = whatsapp._list_messages_sql(False, False, False, has_chat, False, True)
+        with whatsapp.get_conn() as conn:
+            plan = [row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN " + query_sql, params)]
+
+        assert plan[0] == "SEARCH messages " + expected
+
+    def test_invalid_cursor_raises_value_error(self, db):
+        """Test that list_messages rejects a malformed cursor."""
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            whatsapp.list_messages(cursor="not a cursor")
+
+
+class TestMessageContext:
+    """Test suite for the batched context query behind list_messages."""
+
+    @pytest.mark.parametrize("before, after", [(0, 0), (1, 1), (2, 3), (5, 0), (0, 4)])
+    @pytest.mark.parametrize("seeds_per_query", [7, 64])
+    def test_batch_matches_get_message_context(self, db, monkeypatch, before, after, seeds_per_query):
+        """Test that every seed gets exactly the context get_message_context returns."""
+        monkeypatch.setattr(whatsapp, "_CONTEXT_SEEDS_PER_QUERY", seeds_per_query)
+        with whatsapp.get_conn() as conn:
+            cursor = conn.cursor()
+            seeds = cursor.execute(whatsapp._MESSAGE_SELECT + "ORDER BY messages.id DESC").fetchall()
+            batched = [row["id"] for row in whatsapp._get_context_batch(cursor, seeds, before, after)]
+
+        expected = []
+        for seed in seeds:
+            context = whatsapp.get_message_context(seed["id"], before, after)
+            expected.extend(message.id for message in context.before)
+            expected.append(context.message.id)
+            expected.extend(message.id for message in context.after)
+        assert batched == expected
+
+
+class TestTimestamps:
+    """Test suite for converting stored timestamps."""
+
+    def _insert(self, db, message_id, timestamp):
+        """Add a message from 103 in its direct chat to the fixture database."""
+        conn = sqlite3.connect(db)
+        conn.execute(
+            "INSERT INTO messages VALUES (?, '103@s.whatsapp.net', '103', 'hi', ?, 0, NULL)",
+            (message_id, timestamp)
+        )
+        conn.commit()
+        conn.close()
+
+    @pytest.mark.parametrize("zone, expected", [
+        ("Asia/Kolkata", "2024-03-01 15:30:00"),
+        ("UTC", "2024-03-01 10:00:00"),
+        ("America/New_York", "2024-03-01 05:00:00"),
+    ])
+    def test_timestamps_display_in_the_local_zone(self, db, local_zone, zone, expected):
+        """Test that stored times are shown in the server's local zone."""
+        local_zone(zone)
+        self._insert(db, "T", "2024-03-01 15:30:00+05:30")
+
+        context = whatsapp.get_message_context("T")
+
+        assert context.message.timestamp.utcoffset() == context.message.timestamp.astimezone().utcoffset()
+        assert whatsapp.get_last_interaction("103") == f"103 ({expected}) : hi\n"
+
+    def test_zero_timestamp_west_of_utc(self, db, local_zone):
+        """Test that the bridge's zero time falls back to UTC rather than overflowing."""
+        local_zone("America/New_York")
+        self._insert(db, "Z", "0001-01-01 00:00:00+00:00")
+
+        context = whatsapp.get_message_context("Z")
+
+        assert context.message.timestamp.isoformat() == "0001-01-01T00:00:00+00:00"
+        assert whatsapp.get_last_interaction("103") == "103 (0001-01-01 00:00:00) : hi\n"
+
+
+class TestSenderNames:
+    """Test suite for the sender name cache."""
+
+    def _rename(self, db, jid, name):
+        """Rename a contact directly in the fixture database."""
+        conn = sqlite3.connect(db)
+        conn.execute("UPDATE contacts SET name = ? WHERE jid = ?", (name, jid))
+        conn.commit()
+        conn.close()
+
+    def test_names_are_cached(self, db):
+        """Test that a looked-up name is served from the cache."""
+        assert whatsapp.get_sender_name("100") == "Alice"
+        self._rename(db, "100@s.whatsapp.net", "Alicia")
+
+        assert whatsapp.get_sender_name("100") == "Alice"
+
+    def test_cached_names_expire(self, db, monkeypatch):
+        """Test that a renamed contact shows up once its entry expires."""
+        monkeypatch.setattr(whatsapp, "_SENDER_NAME_TTL", 0.0)
+        assert whatsapp.get_sender_name("100") == "Alice"
+        self._rename(db, "100@s.whatsapp.net", "Alicia")
+
+        assert whatsapp.get_sender_name("100") == "Alicia"
+        assert whatsapp._prefetch_sender_names(["100"]) == {"100": "Alicia"}
+
+    def test_lookup_errors_are_not_cached(self, db):
+        """Test that a failed lookup falls back to the JID without being cached."""
+        conn = sqlite3.connect(db)
+        conn.execute("ALTER TABLE contacts RENAME TO contacts_moved")
+        conn.commit()
+
+        assert whatsapp.get_sender_name("100") == "100"
+        assert whatsapp._prefetch_sender_names(["101"]) == {}
+
+        conn.execute("ALTER TABLE contacts_moved RENAME TO contacts")
+        conn.commit()
+        conn.close()
+
+        assert whatsapp.get_sender_name("100") == "Alice"
+        assert whatsapp._prefetch_sender_names(["101"]) == {"101": "Bob"}
+
+    def test_prefetch_fills_the_shared_cache(self, db):
+        """Test that prefetched names are what get_sender_name returns."""
+        names = whatsapp._prefetch_sender_names(["100", "101@s.whatsapp.net", "999"])
+        self._rename(db, "100@s.whatsapp.net", "Alicia")
+
+        assert names == {"100": "Alice", "101@s.whatsapp.net": "Bob", "999": "999"}
+        assert whatsapp.get_sender_name("100") == "Alice"
+
+    def test_clear_contact_cache(self, db):
+        """Test that clearing the cache makes renames visible at once."""
+        assert whatsapp.get_sender_name("100") == "Alice"
+        self._rename(db, "100@s.whatsapp.net", "Alicia")
+        whatsapp.clear_contact_cache()
+
+        assert whatsapp.get_sender_name("100") == "Alicia"
+
+
+class TestLookups:
+    """Test suite for single-row lookups by contact."""
+
+    @pytest.fixture(autouse=True)
+    def utc(self, local_zone):
+        """Render times in UTC so expected lines are fixed."""
+        local_zone("UTC")
+
+    @pytest.mark.parametrize("chat_time, sender_time, expected", [
+        ("2024-04-01 11:00:00+00:00", "2024-04-01 10:00:00+00:00",
+         "You (2024-04-01 11:00:00) : in their chat\n"),
+        ("2024-04-01 10:00:00+00:00", "2024-04-01 11:00:00+00:00",
+         "[Group] 300@s.whatsapp.net (2024-04-01 11:00:00) : in the group\n"),
+    ])
+    def test_last_interaction_picks_the_newer_side(self, db, chat_time, sender_time, expected):
+        """Test that the newest of the chat-side and sender-side messages wins."""
+        _insert_messages(db, [
+            ("L1", "300@s.whatsapp.net", "me", "in their chat", chat_time, 1),
+            ("L2", "200@g.us", "300@s.whatsapp.net", "in the group", sender_time, 0),
+            ("L3", "300@s.whatsapp.net", "me", "older", "2024-01-01 00:00:00+00:00", 1),
+        ])
+
+        assert whatsapp.get_last_interaction("300@s.whatsapp.net") == expected
+
+    def test_last_interaction_without_messages(self, db):
+        """Test that a JID with no messages gets a not-found message."""
+        assert whatsapp.get_last_interaction("999") == "No messages found for 999"
+
+    @pytest.mark.parametrize("first_time, second_time, expected", [
+        ("2024-04-01 09:00:00+00:00", "2024-04-01 10:00:00+00:00", "401@s.whatsapp.net"),
+        ("2024-04-01 10:00:00+00:00", "2024-04-01 09:00:00+00:00", "400@s.whatsapp.net"),
+    ])
+    def test_direct_chat_is_the_most_recent_one(self, db, first_time, second_time, expected):
+        """Test that the contact's most recent direct chat is returned, never a group."""
+        conn = sqlite3.connect(db)
+        conn.executemany("INSERT INTO chats (jid, name) VALUES (?, ?)", [
+            ("400@s.whatsapp.net", "First"), ("401@s.whatsapp.net", "Second"),
+        ])
+        conn.commit()
+        conn.close()
+        _insert_messages(db, [
+            ("D1", "400@s.whatsapp.net", "400", "first", first_time, 0),
+            ("D2", "401@s.whatsapp.net", "400", "second", second_time, 0),
+            ("D3", "200@g.us", "400", "group, newest", "2024-04-01 11:00:00+00:00", 0),
+        ])
+
+        chat = whatsapp.get_direct_chat_by_contact("400")
+
+        assert chat.jid == expected
+        assert not chat.is_group
+
+    def test_direct_chat_missing(self, db):
+        """Test that a sender with no direct chat gets None."""
+        _insert_messages(db, [("D4", "200@g.us", "400", "group only", "2024-04-01 11:00:00+00:00", 0)])
+
+        assert whatsapp.get_direct_chat_by_contact("400") is None
@@ -1,16 +1,52 @@
 import sqlite3
-from datetime import datetime
+import base64
+import functools
+import itertools
+import math
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, List, Tuple
 import os.path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import audio
 
+try:
+    import orjson
+    _jloads = orjson.loads
+except ImportError:
+    _jloads = json.loads
+
 MESSAGES_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'whatsapp-bridge', 'store', 'messages.db')
 WHATSAPP_API_BASE_URL = "http://localhost:8080/api"
-
-@dataclass
+_SEND_URL = f"{WHATSAPP_API_BASE_URL}/send"
+_DOWNLOAD_URL = f"{WHATSAPP_API_BASE_URL}/download"
+
+# Keep-alive session for the bridge API, so successive calls reuse one TCP
+# connection. Retry's defaults only re-send POSTs that never reached the
+# bridge (connection errors), so a send is not duplicated.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.1)
+))
+# (connect, read) timeouts in seconds; downloads wait on the bridge fetching
+# the media, so they get a longer read timeout
+_REQUEST_TIMEOUT = (2, 30)
+_DOWNLOAD_TIMEOUT = (2, 120)
+# Concurrent sends for multi-recipient helpers; below the adapter's pool size
+# so every worker keeps its own connection alive
+_SEND_WORKERS = 8
+
+@dataclass(slots=True, frozen=True)
 class Message:
     timestamp: datetime
     sender: str
@@ -21,7 +57,7 @@ class Message:
     chat_name: Optional[str] = None
     media_type: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Chat:
     jid: str
     name: Optional[str]
@@ -35,22 +71,262 @@ class Chat:
         """Determine if chat is a group based on JID pattern."""
         return self.jid.endswith("@g.us")
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Contact:
     phone_number: str
     name: Optional[str]
     jid: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MessageContext:
     message: Message
     before: List[Message]
     after: List[Message]
 
-def get_sender_name(sender_jid: str) -> str:
-    """Get the display name for a sender JID."""
+# Epoch seconds of messages.timestamp, which every query filters and sorts
+# on. The indexes below are built on this exact expression, so seeks compare
+# 8-byte integer keys instead of ISO text without adding a column to the
+# bridge's schema; queries must spell it the same way to use them.
+_TS_EPOCH = "CAST(strftime('%s', messages.timestamp) AS INTEGER)"
+
+# Indexes backing keyset pagination, per-chat context and sender lookups.
+# ix_msg_chat_ts_id also serves get_message_context's chat/time seeks
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_msg_ts_id ON messages(CAST(strftime('%s', timestamp) AS INTEGER) DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_msg_chat_ts_id ON messages(chat_jid, CAST(strftime('%s', timestamp) AS INTEGER) DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_msg_sender_ts ON messages(sender, CAST(strftime('%s', timestamp) AS INTEGER) DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_contacts_jid ON contacts(jid)",
+    "CREATE INDEX IF NOT EXISTS ix_contacts_phone ON contacts(phone_number)",
+)
+
+# Long-lived connections to the messages database, reused across calls
+_POOL_SIZE = 4
+_POOL: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=_POOL_SIZE)
+_POOL_LOCK = threading.Lock()
+_indexes_created = False
+
+def _open_connection() -> sqlite3.Connection:
+    """Open a tuned connection to the messages database."""
+    global _indexes_created
+    conn = sqlite3.connect(MESSAGES_DB_PATH, check_same_thread=False, detect_types=sqlite3.PARSE_COLNAMES)
+    conn.row_factory = sqlite3.Row
+    try:
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            # Switching modes needs an exclusive lock the bridge may hold;
+            # it is persistent, so a later connection will succeed
+            pass
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        with _POOL_LOCK:
+            if not _indexes_created:
+                try:
+                    for statement in _INDEXES:
+                        try:
+                            conn.execute(statement)
+                        except sqlite3.OperationalError as e:
+                            # The bridge does not always create contacts
+                            if "no such table" not in str(e):
+                                raise
+                    # Refresh planner statistics so the new indexes are
+                    # chosen; analysis_limit keeps this quick on large stores
+                    conn.execute("PRAGMA analysis_limit=1000")
+                    conn.execute("ANALYZE")
+                    _indexes_created = True
+                except sqlite3.OperationalError as e:
+                    # Queries still work without the indexes; retried by the
+                    # next connection opened
+                    print(f"Could not create indexes: {e}")
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+# Message columns for _row_to_message. Timestamps are read as epoch seconds,
+# so no ISO string is parsed in Python, and come back timezone-aware in the
+# server's local zone
+_MESSAGE_COLUMNS = f"""
+    {_TS_EPOCH} AS ts_epoch, messages.sender, chats.name as chat_name,
+    messages.content, messages.is_from_me, messages.chat_jid,
+    messages.id, messages.media_type
+"""
+_MESSAGE_SELECT = f"""
+    SELECT {_MESSAGE_COLUMNS}
+    FROM messages
+    LEFT JOIN chats ON messages.chat_jid = chats.jid
+"""
+
+# Columns aliased as "name [isodatetime]" are parsed into datetimes by the
+# sqlite3 module while rows are fetched. Only aliased columns are converted,
+# so raw timestamps remain available as cursor keys.
+sqlite3.register_converter("isodatetime", lambda value: datetime.fromisoformat(value.decode()) if value else None)
+
+# Chat columns for _row_to_chat, with or without the last message details
+_CHAT_COLUMNS = """
+    chats.jid, chats.name, chats.last_message_time AS "last_message_at [isodatetime]",
+    chats.last_message, chats.last_sender, chats.last_is_from_me
+"""
+_CHAT_COLUMNS_WITHOUT_LAST = """
+    chats.jid, chats.name, chats.last_message_time AS "last_message_at [isodatetime]",
+    NULL AS last_message, NULL AS last_sender, NULL AS last_is_from_me
+"""
+
+def _row_to_chat(row: sqlite3.Row) -> Chat:
+    """Build a Chat from a row selected with _CHAT_COLUMNS."""
+    return Chat(
+        jid=row["jid"],
+        name=row["name"],
+        last_message_time=row["last_message_at"],
+        last_message=row["last_message"],
+        last_sender=row["last_sender"],
+        last_is_from_me=row["last_is_from_me"]
+    )
+
+def _epoch_to_datetime(ts_epoch: int) -> datetime:
+    """Convert stored epoch seconds to an aware datetime in the local zone."""
+    moment = datetime.fromtimestamp(ts_epoch, timezone.utc)
     try:
-        conn = sqlite3.connect(MESSAGES_DB_PATH)
+        return moment.astimezone()
+    except OverflowError:
+        # The bridge's zero time, 0001-01-01 00:00:00+00:00, has no local
+        # equivalent west of UTC; keep it in UTC
+        return moment
+
+def _row_to_message(row: sqlite3.Row) -> Message:
+    """Build a Message from a row selected with _MESSAGE_SELECT's columns."""
+    return Message(
+        timestamp=_epoch_to_datetime(row["ts_epoch"]),
+        sender=row["sender"],
+        chat_name=row["chat_name"],
+        content=row["content"],
+        is_from_me=row["is_from_me"],
+        chat_jid=row["chat_jid"],
+        id=row["id"],
+        media_type=row["media_type"]
+    )
+
+# Rows fetched per fetchmany call, and messages formatted per name prefetch
+_FETCH_BATCH_SIZE = 256
+
+def _iter_rows(cursor: sqlite3.Cursor) -> Iterator[sqlite3.Row]:
+    """Yield a cursor's rows, fetching them in batches instead of all at once."""
+    while True:
+        batch = cursor.fetchmany(_FETCH_BATCH_SIZE)
+        if not batch:
+            return
+        yield from batch
+
+def _batches(items: Iterable[Any]) -> Iterator[List[Any]]:
+    """Split an iterable into lists of up to _FETCH_BATCH_SIZE items."""
+    items = iter(items)
+    while True:
+        batch = list(itertools.islice(items, _FETCH_BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+def _iter_messages(cursor: sqlite3.Cursor) -> Iterator[Message]:
+    """Yield a Message for each row of a _MESSAGE_SELECT query as rows arrive."""
+    return map(_row_to_message, _iter_rows(cursor))
+
+@contextmanager
+def get_conn() -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled connection to the messages database.
+
+    Connections are opened on demand. When every pooled connection is in
+    use (for example by nested calls) an extra one is opened and closed on
+    return rather than blocking, so nested borrows cannot deadlock.
+    """
+    try:
+        conn = _POOL.get_nowait()
+    except queue.Empty:
+        conn = _open_connection()
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _POOL.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+def _encode_cursor(key: Any, tiebreak: str) -> str:
+    """Encode the sort key and tiebreaker of the last row as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps([key, tiebreak]).encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """Decode a cursor produced by _encode_cursor into (key, tiebreak)."""
+    try:
+        key, tiebreak = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid pagination cursor: {cursor}")
+    return key, tiebreak
+
+def _keyset_sql(column: str, descending: bool, tie_column: str, null_key: bool) -> str:
+    """Build the WHERE clause selecting rows after a cursor in sort order.
+
+    SQLite sorts NULLs first, so they come last in descending order and
+    first in ascending order. Bind _keyset_params for the cursor.
+    """
+    if descending:
+        if null_key:
+            return f"({column} IS NULL AND {tie_column} < ?)"
+        return f"(({column}, {tie_column}) < (?, ?) OR {column} IS NULL)"
+    if null_key:
+        return f"({column} IS NOT NULL OR {tie_column} > ?)"
+    return f"(({column}, {tie_column}) > (?, ?))"
+
+def _keyset_params(key: Any, tiebreak: str) -> List[Any]:
+    """Parameters for the clause _keyset_sql builds for (key, tiebreak)."""
+    return [tiebreak] if key is None else [key, tiebreak]
+
+def _keyset_clause(column: str, descending: bool, tie_column: str, key: Any, tiebreak: str) -> Tuple[str, List[Any]]:
+    """Build the WHERE clause and parameters selecting rows after (key, tiebreak)."""
+    return _keyset_sql(column, descending, tie_column, key is None), _keyset_params(key, tiebreak)
+
+def _paginated(data: Any, next_cursor: Optional[str]) -> Dict[str, Any]:
+    """Wrap one page of results with the cursor continuing after it.
+
+    Listings fetch one row past the page to learn whether more follow, so
+    no total is counted and has_more is exact.
+    """
+    return {"data": data, "next_cursor": next_cursor, "has_more": next_cursor is not None}
+
+# Display names by sender JID, with the time.monotonic() they expire at.
+# Shared by get_sender_name and _prefetch_sender_names; only successful
+# lookups are stored, and entries expire so renamed contacts show up.
+_SENDER_NAME_TTL = 300.0
+_SENDER_NAME_CACHE_SIZE = 4096
+_sender_names: Dict[str, Tuple[str, float]] = {}
+_SENDER_NAMES_LOCK = threading.Lock()
+
+def _cached_sender_name(sender_jid: str) -> Optional[str]:
+    """Return the cached name for a JID, or None if missing or expired."""
+    entry = _sender_names.get(sender_jid)
+    if entry is None or entry[1] <= time.monotonic():
+        return None
+    return entry[0]
+
+def _cache_sender_names(names: Dict[str, str]) -> None:
+    """Store looked-up names, evicting the oldest entries beyond the size cap."""
+    expires = time.monotonic() + _SENDER_NAME_TTL
+    with _SENDER_NAMES_LOCK:
+        for sender_jid, name in names.items():
+            # Re-insert so eviction order follows the latest store
+            _sender_names.pop(sender_jid, None)
+            _sender_names[sender_jid] = (name, expires)
+        while len(_sender_names) > _SENDER_NAME_CACHE_SIZE:
+            del _sender_names[next(iter(_sender_names))]
+
+def _lookup_sender_name(sender_jid: str) -> str:
+    """Read a sender's display name from contacts, without caching.
+
+    Raises sqlite3.Error if the lookup fails.
+    """
+    with get_conn() as conn:
         cursor = conn.cursor()
 
         # Try to get contact name first
@@ -66,48 +342,264 @@ def get_sender_name(sender_jid: str) -> str:
         # If no contact name, return the JID/phone number
         return sender_jid
 
+def get_sender_name(sender_jid: str) -> str:
+    """Get the display name for a sender JID.
+
+    Results are cached for _SENDER_NAME_TTL seconds; call
+    clear_contact_cache() to see contact changes sooner.
+    """
+    name = _cached_sender_name(sender_jid)
+    if name is not None:
+        return name
+
+    try:
+        name = _lookup_sender_name(sender_jid)
     except sqlite3.Error as e:
+        # Not cached, so the next call retries the lookup
         print(f"Database error while getting sender name: {e}")
         return sender_jid
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
-def format_message(message: Message, show_chat_info: bool = True) -> str:
-    """Format a single message with consistent formatting."""
-    sender_name = get_sender_name(message.sender)
-
-    # Format timestamp
-    time_str = message.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-
-    # Build message string
-    msg_parts = []
-
-    if show_chat_info and message.chat_name:
-        msg_parts.append(f"[{message.chat_name}]")
-
-    if message.is_from_me:
-        msg_parts.append(f"You ({time_str})")
-    else:
-        msg_parts.append(f"{sender_name} ({time_str})")
-
-    if message.media_type:
-        msg_parts.append(f"[{message.media_type.upper()}]")
-
-    msg_parts.append(f": {message.content}")
-
-    return " ".join(msg_parts) + "\n"
-
-def format_messages_list(messages: List[Message], show_chat_info: bool = True) -> str:
-    """Format a list of messages for display."""
-    output = ""
-    if not messages:
-        output += "No messages to display."
-        return output
+    _cache_sender_names({sender_jid: name})
+    return name
+
+def _prefetch_sender_names(jids: Iterable[str]) -> Dict[str, str]:
+    """Look up display names for many senders in one query and cache them.
+
+    Returns a mapping of each JID to the name get_sender_name would return.
+    Cached names are reused; if the query fails, only those are returned.
+    """
+    names = {}
+    missing = set()
+    for jid in set(jids):
+        name = _cached_sender_name(jid)
+        if name is None:
+            missing.add(jid)
+        else:
+            names[jid] = name
+    if not missing:
+        return names
 
-    for message in messages:
-        output += format_message(message, show_chat_info)
-    return output
+    placeholders = ", ".join("?" for _ in missing)
+    try:
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT jid, phone_number, name FROM contacts
+                WHERE jid IN ({placeholders}) OR phone_number IN ({placeholders})
+            """, (*missing, *missing))
+            rows = cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"Database error while prefetching sender names: {e}")
+        return names
+
+    # Like get_sender_name, the first matching contact decides the name
+    matches = {}
+    for jid, phone_number, name in rows:
+        for key in (jid, phone_number):
+            if key in missing:
+                matches.setdefault(key, name)
+    fetched = {jid: matches.get(jid) or jid for jid in missing}
+
+    _cache_sender_names(fetched)
+    names.update(fetched)
+    return names
+
+def clear_contact_cache() -> None:
+    """Forget cached sender names, e.g. after contacts were added or renamed."""
+    with _SENDER_NAMES_LOCK:
+        _sender_names.clear()
+
+def _format_line(
+    timestamp: datetime,
+    sender_name: str,
+    chat_name: Optional[str],
+    media_type: Optional[str],
+    content: str,
+    show_chat_info: bool
+) -> str:
+    """Render one message line: "[chat] sender (time) [MEDIA] : content"."""
+    # Format timestamp; isoformat is implemented in C and much cheaper than
+    # strftime, and the slice drops any UTC offset
+    time_str = timestamp.isoformat(sep=" ", timespec="seconds")[:19]
+
+    chat_part = f"[{chat_name}] " if show_chat_info and chat_name else ""
+    media_part = f" [{media_type.upper()}]" if media_type else ""
+
+    return f"{chat_part}{sender_name} ({time_str}){media_part} : {content}\n"
+
+def _display_name(sender: str, is_from_me: bool, sender_names: Optional[Dict[str, str]]) -> str:
+    """Name to show for a sender, preferring prefetched names over lookups."""
+    if is_from_me:
+        return "You"
+    sender_name = sender_names.get(sender) if sender_names else None
+    if sender_name is None:
+        sender_name = get_sender_name(sender)
+    return sender_name
+
+def format_message(
+    message: Message,
+    show_chat_info: bool = True,
+    sender_names: Optional[Dict[str, str]] = None
+) -> str:
+    """Format a single message with consistent formatting.
+
+    ``sender_names`` maps sender JIDs to display names, as returned by
+    _prefetch_sender_names; senders missing from it are looked up.
+    """
+    return _format_line(
+        message.timestamp,
+        _display_name(message.sender, message.is_from_me, sender_names),
+        message.chat_name,
+        message.media_type,
+        message.content,
+        show_chat_info
+    )
+
+def format_messages_list(messages: Iterable[Message], show_chat_info: bool = True) -> str:
+    """Format messages for display.
+
+    Messages are consumed in batches, so a generator is formatted as it is
+    produced; sender names are prefetched once per batch.
+    """
+    output = []
+    for batch in _batches(messages):
+        sender_names = _prefetch_sender_names(
+            {message.sender for message in batch if not message.is_from_me}
+        )
+        output.extend(format_message(message, show_chat_info, sender_names) for message in batch)
+
+    if not output:
+        return "No messages to display."
+    return "".join(output)
+
+def _format_row(row: sqlite3.Row, show_chat_info: bool, sender_names: Optional[Dict[str, str]]) -> str:
+    """Format a _MESSAGE_SELECT row exactly as format_message formats its Message."""
+    return _format_line(
+        _epoch_to_datetime(row["ts_epoch"]),
+        _display_name(row["sender"], row["is_from_me"], sender_names),
+        row["chat_name"],
+        row["media_type"],
+        row["content"],
+        show_chat_info
+    )
+
+def _format_rows(rows: Iterable[sqlite3.Row], show_chat_info: bool = True) -> str:
+    """format_messages_list for raw rows, skipping Message construction."""
+    output = []
+    for batch in _batches(rows):
+        sender_names = _prefetch_sender_names(
+            {row["sender"] for row in batch if not row["is_from_me"]}
+        )
+        output.extend(_format_row(row, show_chat_info, sender_names) for row in batch)
+
+    if not output:
+        return "No messages to display."
+    return "".join(output)
+
+# One branch per part of a seed's context: earlier messages, the seed and
+# later messages. Each is a seek on ix_msg_chat_ts_id (or the primary key)
+# reading at most LIMIT rows, however long the chat is.
+_CONTEXT_BEFORE_SQL = f"""
+    SELECT * FROM (
+        SELECT ? AS seed_order, 0 AS part, {_MESSAGE_COLUMNS}
+        FROM messages
+        LEFT JOIN chats ON messages.chat_jid = chats.jid
+        WHERE messages.chat_jid = ? AND {_TS_EPOCH} < ?
+        ORDER BY {_TS_EPOCH} DESC, messages.id DESC
+        LIMIT ?
+    )
+"""
+_CONTEXT_SEED_SQL = f"""
+    SELECT ? AS seed_order, 1 AS part, {_MESSAGE_COLUMNS}
+    FROM messages
+    LEFT JOIN chats ON messages.chat_jid = chats.jid
+    WHERE messages.id = ? AND messages.chat_jid = ?
+"""
+_CONTEXT_AFTER_SQL = f"""
+    SELECT * FROM (
+        SELECT ? AS seed_order, 2 AS part, {_MESSAGE_COLUMNS}
+        FROM messages
+        LEFT JOIN chats ON messages.chat_jid = chats.jid
+        WHERE messages.chat_jid = ? AND {_TS_EPOCH} > ?
+        ORDER BY {_TS_EPOCH} ASC, messages.id ASC
+        LIMIT ?
+    )
+"""
+
+# Seeds per context query, keeping its compound SELECT and parameter count
+# under SQLite's default limits (500 terms, 999 variables)
+_CONTEXT_SEEDS_PER_QUERY = 64
+
+def _get_context_batch(
+    cursor: sqlite3.Cursor,
+    seeds: List[sqlite3.Row],
+    before: int,
+    after: int
+) -> Iterator[sqlite3.Row]:
+    """Get each seed message surrounded by its chat context.
+
+    Yields, for every seed in order, up to ``before`` earlier messages, the
+    seed itself and up to ``after`` later messages from the same chat,
+    exactly as get_message_context selects them. Messages sharing the
+    seed's timestamp are excluded. Seeds are fetched in one UNION ALL query
+    per _CONTEXT_SEEDS_PER_QUERY of them.
+    """
+    for start in range(0, len(seeds), _CONTEXT_SEEDS_PER_QUERY):
+        branches = []
+        params = []
+        for order, seed in enumerate(seeds[start:start + _CONTEXT_SEEDS_PER_QUERY]):
+            if before > 0:
+                branches.append(_CONTEXT_BEFORE_SQL)
+                params.extend((order, seed["chat_jid"], seed["ts_epoch"], before))
+            branches.append(_CONTEXT_SEED_SQL)
+            params.extend((order, seed["id"], seed["chat_jid"]))
+            if after > 0:
+                branches.append(_CONTEXT_AFTER_SQL)
+                params.extend((order, seed["chat_jid"], seed["ts_epoch"], after))
+
+        cursor.execute(
+            " UNION ALL ".join(branches) + " ORDER BY seed_order, part, ts_epoch, id",
+            params
+        )
+        yield from _iter_rows(cursor)
+
+@functools.lru_cache(maxsize=None)
+def _list_messages_sql(
+    has_after: bool,
+    has_before: bool,
+    has_sender: bool,
+    has_chat: bool,
+    has_query: bool,
+    has_cursor: bool
+) -> str:
+    """Build list_messages' SQL for one combination of filters, once.
+
+    Parameters bind in the order of the flags, followed by the cursor's
+    (ts_epoch, ts_epoch, id), then LIMIT.
+    """
+    where_clauses = []
+    if has_after:
+        where_clauses.append(f"{_TS_EPOCH} > ?")
+    if has_before:
+        where_clauses.append(f"{_TS_EPOCH} < ?")
+    if has_sender:
+        where_clauses.append("messages.sender = ?")
+    if has_chat:
+        where_clauses.append("messages.chat_jid = ?")
+    if has_query:
+        # LIKE already ignores ASCII case, which is all LOWER() folds
+        where_clauses.append("messages.content LIKE ?")
+    if has_cursor:
+        # SQLite does not seek on a row value over an expression index, so
+        # the redundant leading bound turns the cursor into a range seek
+        where_clauses.append(f"{_TS_EPOCH} <= ? AND ({_TS_EPOCH}, messages.id) < (?, ?)")
+
+    query_parts = [_MESSAGE_SELECT]
+    if where_clauses:
+        query_parts.append("WHERE " + " AND ".join(where_clauses))
+    query_parts.append(f"ORDER BY {_TS_EPOCH} DESC, messages.id DESC")
+    query_parts.append("LIMIT ?")
+    return " ".join(query_parts)
 
 def list_messages(
     after: Optional[str] = None,
@@ -116,104 +608,82 @@ def list_messages(
     chat_jid: Optional[str] = None,
     query: Optional[str] = None,
     limit: int = 20,
-    page: int = 0,
     include_context: bool = True,
     context_before: int = 1,
-    context_after: int = 1
-) -> List[Message]:
-    """Get messages matching the specified criteria with optional context."""
+    context_after: int = 1,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get messages matching the specified criteria with optional context.
+
+    Returns {"data": formatted messages, "next_cursor": ..., "has_more": ...}.
+    Pass next_cursor back as ``cursor`` to fetch the following page; it seeks
+    directly past the last row. Pages can only be walked in order, there is
+    no jumping to an arbitrary page.
+    """
     try:
-        conn = sqlite3.connect(MESSAGES_DB_PATH)
-        cursor = conn.cursor()
+        with get_conn() as conn:
+            db_cursor = conn.cursor()
 
-        # Build query
-        query_parts = ["""
-            SELECT messages.timestamp, messages.sender, chats.name as chat_name,
-                   messages.content, messages.is_from_me, messages.chat_jid,
-                   messages.id, messages.media_type
-            FROM messages
-            LEFT JOIN chats ON messages.chat_jid = chats.jid
-        """]
+            params = []
 
-        where_clauses = []
-        params = []
+            if after:
+                try:
+                    after = datetime.fromisoformat(after)
+                except ValueError:
+                    raise ValueError(f"Invalid date format for 'after': {after}. Please use ISO-8601 format.")
 
-        if after:
-            try:
-                after = datetime.fromisoformat(after)
-            except ValueError:
-                raise ValueError(f"Invalid date format for 'after': {after}. Please use ISO-8601 format.")
+                # Stored times are whole seconds, so rounding the bound
+                # outwards keeps the comparison exact
+                params.append(math.floor(after.timestamp()))
 
-            where_clauses.append("messages.timestamp > ?")
-            params.append(after)
+            if before:
+                try:
+                    before = datetime.fromisoformat(before)
+                except ValueError:
+                    raise ValueError(f"Invalid date format for 'before': {before}. Please use ISO-8601 format.")
 
-        if before:
-            try:
-                before = datetime.fromisoformat(before)
-            except ValueError:
-                raise ValueError(f"Invalid date format for 'before': {before}. Please use ISO-8601 format.")
-
-            where_clauses.append("messages.timestamp < ?")
-            params.append(before)
-
-        if sender_phone_number:
-            where_clauses.append("messages.sender = ?")
-            params.append(sender_phone_number)
-
-        if chat_jid:
-            where_clauses.append("messages.chat_jid = ?")
-            params.append(chat_jid)
-
-        if query:
-            where_clauses.append("LOWER(messages.content) LIKE LOWER(?)")
-            params.append(f"%{query}%")
-
-        if where_clauses:
-            query_parts.append("WHERE " + " AND ".join(where_clauses))
-
-        # Add pagination
-        offset = page * limit
-        query_parts.append("ORDER BY messages.timestamp DESC")
-        query_parts.append("LIMIT ? OFFSET ?")
-        params.extend([limit, offset])
-
-        cursor.execute(" ".join(query_parts), tuple(params))
-        messages = cursor.fetchall()
-
-        result = []
-        for msg in messages:
-            message = Message(
-                timestamp=datetime.fromisoformat(msg[0]),
-                sender=msg[1],
-                chat_name=msg[2],
-                content=msg[3],
-                is_from_me=msg[4],
-                chat_jid=msg[5],
-                id=msg[6],
-                media_type=msg[7]
+                params.append(math.ceil(before.timestamp()))
+
+            if sender_phone_number:
+                params.append(sender_phone_number)
+
+            if chat_jid:
+                params.append(chat_jid)
+
+            if query:
+                params.append(f"%{query}%")
+
+            if cursor:
+                cursor_epoch, cursor_id = _decode_cursor(cursor)
+                params.extend([cursor_epoch, cursor_epoch, cursor_id])
+
+            params.append(limit + 1)
+
+            query_sql = _list_messages_sql(
+                bool(after), bool(before), bool(sender_phone_number),
+                bool(chat_jid), bool(query), bool(cursor)
             )
-            result.append(message)
+            db_cursor.execute(query_sql, tuple(params))
+            # Rows are only rendered, so they are formatted without building
+            # Message objects
+            rows = db_cursor.fetchall()
+
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1]["ts_epoch"], rows[-1]["id"]) if has_more and rows else None
 
-        if include_context and result:
-            # Add context for each message
-            messages_with_context = []
-            for msg in result:
-                context = get_message_context(msg.id, context_before, context_after)
-                messages_with_context.extend(context.before)
-                messages_with_context.append(context.message)
-                messages_with_context.extend(context.after)
+            if include_context and rows:
+                # Add context for every message in one query
+                rows_with_context = _get_context_batch(db_cursor, rows, context_before, context_after)
 
-            return format_messages_list(messages_with_context, show_chat_info=True)
+                return _paginated(_format_rows(rows_with_context, show_chat_info=True), next_cursor)
 
-        # Format and display messages without context
-        return format_messages_list(result, show_chat_info=True)
+            # Format and display messages without context
+            return _paginated(_format_rows(rows, show_chat_info=True), next_cursor)
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        return []
-    finally:
-        if 'conn' in locals():
-            conn.close()
+        return _paginated([], None)
 
 def get_message_context(
     message_id: str,
@@ -222,368 +692,330 @@ def get_message_context(
 ) -> MessageContext:
     """Get context around a specific message."""
     try:
-        conn = sqlite3.connect(MESSAGES_DB_PATH)
-        cursor = conn.cursor()
-
-        # Get the target message
-        cursor.execute("""
-            SELECT messages.timestamp, messages.sender, chats.name as chat_name,
-                   messages.content, messages.is_from_me, messages.chat_jid,
-                   messages.id, messages.media_type
-            FROM messages
-            LEFT JOIN chats ON messages.chat_jid = chats.jid
-            WHERE messages.id = ?
-        """, (message_id,))
-
-        msg_data = cursor.fetchone()
-        if not msg_data:
-            raise ValueError(f"Message with ID {message_id} not found")
-
-        target_message = Message(
-            timestamp=datetime.fromisoformat(msg_data[0]),
-            sender=msg_data[1],
-            chat_name=msg_data[2],
-            content=msg_data[3],
-            is_from_me=msg_data[4],
-            chat_jid=msg_data[5],
-            id=msg_data[6],
-            media_type=msg_data[7]
-        )
-
-        # Get messages before
-        cursor.execute("""
-            SELECT messages.timestamp, messages.sender, chats.name as chat_name,
-                   messages.content, messages.is_from_me, messages.chat_jid,
-                   messages.id, messages.media_type
-            FROM messages
-            LEFT JOIN chats ON messages.chat_jid = chats.jid
-            WHERE messages.chat_jid = ? AND messages.timestamp < ?
-            ORDER BY messages.timestamp DESC
-            LIMIT ?
-        """, (target_message.chat_jid, target_message.timestamp, before))
-
-        before_messages = []
-        for msg in reversed(cursor.fetchall()):  # Reverse to get chronological order
-            before_messages.append(Message(
-                timestamp=datetime.fromisoformat(msg[0]),
-                sender=msg[1],
-                chat_name=msg[2],
-                content=msg[3],
-                is_from_me=msg[4],
-                chat_jid=msg[5],
-                id=msg[6],
-                media_type=msg[7]
-            ))
-
-        # Get messages after
-        cursor.execute("""
-            SELECT messages.timestamp, messages.sender, chats.name as chat_name,
-                   messages.content, messages.is_from_me, messages.chat_jid,
-                   messages.id, messages.media_type
-            FROM messages
-            LEFT JOIN chats ON messages.chat_jid = chats.jid
-            WHERE messages.chat_jid = ? AND messages.timestamp > ?
-            ORDER BY messages.timestamp ASC
-            LIMIT ?
-        """, (target_message.chat_jid, target_message.timestamp, after))
-
-        after_messages = []
-        for msg in cursor.fetchall():
-            after_messages.append(Message(
-                timestamp=datetime.fromisoformat(msg[0]),
-                sender=msg[1],
-                chat_name=msg[2],
-                content=msg[3],
-                is_from_me=msg[4],
-                chat_jid=msg[5],
-                id=msg[6],
-                media_type=msg[7]
-            ))
-
-        return MessageContext(
-            message=target_message,
-            before=before_messages,
-            after=after_messages
-        )
+        with get_conn() as conn:
+            cursor = conn.cursor()
+
+            # Get the target message
+            cursor.execute(_MESSAGE_SELECT + "WHERE messages.id = ?", (message_id,))
+
+            msg_data = cursor.fetchone()
+            if not msg_data:
+                raise ValueError(f"Message with ID {message_id} not found")
+
+            target_message = _row_to_message(msg_data)
+
+            # Get messages before
+            cursor.execute(_MESSAGE_SELECT + f"""
+                WHERE messages.chat_jid = ? AND {_TS_EPOCH} < ?
+                ORDER BY {_TS_EPOCH} DESC, messages.id DESC
+                LIMIT ?
+            """, (target_message.chat_jid, msg_data["ts_epoch"], before))
+
+            # Reverse to get chronological order
+            before_messages = list(_iter_messages(cursor))
+            before_messages.reverse()
+
+            # Get messages after
+            cursor.execute(_MESSAGE_SELECT + f"""
+                WHERE messages.chat_jid = ? AND {_TS_EPOCH} > ?
+                ORDER BY {_TS_EPOCH} ASC, messages.id ASC
+                LIMIT ?
+            """, (target_message.chat_jid, msg_data["ts_epoch"], after))
+
+            after_messages = list(_iter_messages(cursor))
+
+            return MessageContext(
+                message=target_message,
+                before=before_messages,
+                after=after_messages
+            )
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         raise
-    finally:
-        if 'conn' in locals():
-            conn.close()
+
+# Sort column, direction and the result column holding the raw sort key for
+# each accepted list_chats sort_by
+_CHAT_SORTS = {
+    "last_active": ("chats.last_message_time", True, "last_message_time"),
+    "name": ("chats.name", False, "name"),
+}
+
+@functools.lru_cache(maxsize=None)
+def _list_chats_sql(
+    include_last_message: bool,
+    has_query: bool,
+    sort_by: str,
+    cursor_null_key: Optional[bool]
+) -> str:
+    """Build list_chats' SQL for one combination of options, once.
+
+    ``cursor_null_key`` is None without a cursor, otherwise whether the
+    cursor's sort key is NULL. Parameters bind as the query pattern, the
+    cursor's _keyset_params, then LIMIT.
+    """
+    columns = _CHAT_COLUMNS if include_last_message else _CHAT_COLUMNS_WITHOUT_LAST
+    query_sql = f"SELECT {columns}, chats.last_message_time FROM chats"
+
+    sort_column, descending, _ = _CHAT_SORTS[sort_by]
+
+    where_clauses = []
+    if has_query:
+        where_clauses.append("chats.name LIKE ?")
+    if cursor_null_key is not None:
+        where_clauses.append(_keyset_sql(sort_column, descending, "chats.jid", cursor_null_key))
+    if where_clauses:
+        query_sql += " WHERE " + " AND ".join(where_clauses)
+
+    direction = "DESC" if descending else "ASC"
+    query_sql += f" ORDER BY {sort_column} {direction}, chats.jid {direction}"
+    query_sql += " LIMIT ?"
+    return query_sql
 
 def list_chats(
     query: Optional[str] = None,
     limit: int = 20,
-    page: int = 0,
     include_last_message: bool = True,
-    sort_by: str = "last_active"
-) -> List[Chat]:
-    """Get chats matching the specified criteria."""
+    sort_by: str = "last_active",
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get chats matching the specified criteria.
+
+    Returns one page of chats as {"data", "next_cursor", "has_more"}; see
+    list_messages.
+    """
     try:
-        conn = sqlite3.connect(MESSAGES_DB_PATH)
-        cursor = conn.cursor()
+        with get_conn() as conn:
+            db_cursor = conn.cursor()
 
-        # Build query based on parameters
-        if include_last_message:
-            query_sql = """
-                SELECT chats.jid, chats.name, chats.last_message_time,
-                       chats.last_message, chats.last_sender, chats.last_is_from_me
-                FROM chats
-            """
-        else:
-            query_sql = """
-                SELECT chats.jid, chats.name, chats.last_message_time,
-                       NULL, NULL, NULL
-                FROM chats
-            """
+            if sort_by not in _CHAT_SORTS:
+                raise ValueError(f"Invalid sort_by: {sort_by!r}. Use one of: {', '.join(_CHAT_SORTS)}")
+            key_column = _CHAT_SORTS[sort_by][2]
 
-        where_clauses = []
-        params = []
+            params = []
 
-        if query:
-            where_clauses.append("LOWER(chats.name) LIKE LOWER(?)")
-            params.append(f"%{query}%")
-
-        if where_clauses:
-            query_sql += " WHERE " + " AND ".join(where_clauses)
-
-        # Add sorting
-        if sort_by == "last_active":
-            query_sql += " ORDER BY chats.last_message_time DESC"
-        elif sort_by == "name":
-            query_sql += " ORDER BY chats.name ASC"
-
-        # Add pagination
-        offset = page * limit
-        query_sql += " LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-
-        cursor.execute(query_sql, tuple(params))
-        chats_data = cursor.fetchall()
-
-        result = []
-        for chat_data in chats_data:
-            chat = Chat(
-                jid=chat_data[0],
-                name=chat_data[1],
-                last_message_time=datetime.fromisoformat(chat_data[2]) if chat_data[2] else None,
-                last_message=chat_data[3],
-                last_sender=chat_data[4],
-                last_is_from_me=chat_data[5]
-            )
-            result.append(chat)
+            if query:
+                params.append(f"%{query}%")
+
+            cursor_null_key = None
+            if cursor:
+                key, tiebreak = _decode_cursor(cursor)
+                cursor_null_key = key is None
+                params.extend(_keyset_params(key, tiebreak))
 
-        return result
+            params.append(limit + 1)
+
+            query_sql = _list_chats_sql(include_last_message, bool(query), sort_by, cursor_null_key)
+            db_cursor.execute(query_sql, tuple(params))
+            chats_data = db_cursor.fetchall()
+
+            has_more = len(chats_data) > limit
+            chats_data = chats_data[:limit]
+            next_cursor = _encode_cursor(chats_data[-1][key_column], chats_data[-1]["jid"]) if has_more and chats_data else None
+
+            result = [_row_to_chat(chat_data) for chat_data in chats_data]
+
+            return _paginated(result, next_cursor)
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        return []
-    finally:
-        if 'conn' in locals():
-            conn.close()
+        return _paginated([], None)
 
 def search_contacts(query: str) -> List[Contact]:
     """Search contacts by name or phone number."""
     try:
-        conn = sqlite3.connect(MESSAGES_DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT phone_number, name, jid
-            FROM contacts
-            WHERE LOWER(name) LIKE LOWER(?) OR phone_number LIKE ?
-            ORDER BY name ASC
-            LIMIT 50
-        """, (f"%{query}%", f"%{query}%"))
-
-        contacts_data = cursor.fetchall()
-        result = []
-
-        for contact_data in contacts_data:
-            contact = Contact(
-                phone_number=contact_data[0],
-                name=contact_data[1],
-                jid=contact_data[2]
-            )
-            result.append(contact)
+        with get_conn() as conn:
+            cursor = conn.cursor()
 
-        return result
+            cursor.execute("""
+                SELECT phone_number, name, jid
+                FROM contacts
+                WHERE name LIKE ? OR phone_number LIKE ?
+                ORDER BY name ASC
+                LIMIT 50
+            """, (f"%{query}%", f"%{query}%"))
+
+            contacts_data = cursor.fetchall()
+            result = []
+
+            for contact_data in contacts_data:
+                contact = Contact(
+                    phone_number=contact_data[0],
+                    name=contact_data[1],
+                    jid=contact_data[2]
+                )
+                result.append(contact)
+
+            return result
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         return []
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
-def get_contact_chats(jid: str, limit: int = 20, page: int = 0) -> List[Chat]:
-    """Get all chats involving a specific contact."""
+def get_contact_chats(
+    jid: str,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get all chats involving a specific contact.
+
+    Returns one page of chats as {"data", "next_cursor", "has_more"}; see
+    list_messages.
+    """
     try:
-        conn = sqlite3.connect(MESSAGES_DB_PATH)
-        cursor = conn.cursor()
+        with get_conn() as conn:
+            db_cursor = conn.cursor()
 
-        offset = page * limit
+            where_sql = "(messages.sender = ? OR chats.jid = ?)"
+            params = [jid, jid]
 
-        cursor.execute("""
-            SELECT DISTINCT chats.jid, chats.name, chats.last_message_time,
-                            chats.last_message, chats.last_sender, chats.last_is_from_me
-            FROM chats
-            JOIN messages ON chats.jid = messages.chat_jid
-            WHERE messages.sender = ? OR chats.jid = ?
-            ORDER BY chats.last_message_time DESC
-            LIMIT ? OFFSET ?
-        """, (jid, jid, limit, offset))
-
-        chats_data = cursor.fetchall()
-        result = []
-
-        for chat_data in chats_data:
-            chat = Chat(
-                jid=chat_data[0],
-                name=chat_data[1],
-                last_message_time=datetime.fromisoformat(chat_data[2]) if chat_data[2] else None,
-                last_message=chat_data[3],
-                last_sender=chat_data[4],
-                last_is_from_me=chat_data[5]
-            )
-            result.append(chat)
+            if cursor:
+                key, tiebreak = _decode_cursor(cursor)
+                clause, clause_params = _keyset_clause("chats.last_message_time", True, "chats.jid", key, tiebreak)
+                where_sql += " AND " + clause
+                params.extend(clause_params)
 
-        return result
+            params.append(limit + 1)
+
+            db_cursor.execute(f"""
+                SELECT DISTINCT {_CHAT_COLUMNS}, chats.last_message_time
+                FROM chats
+                JOIN messages ON chats.jid = messages.chat_jid
+                WHERE {where_sql}
+                ORDER BY chats.last_message_time DESC, chats.jid DESC
+                LIMIT ?
+            """, tuple(params))
+
+            chats_data = db_cursor.fetchall()
+            has_more = len(chats_data) > limit
+            chats_data = chats_data[:limit]
+            next_cursor = _encode_cursor(chats_data[-1]["last_message_time"], chats_data[-1]["jid"]) if has_more and chats_data else None
+
+            result = [_row_to_chat(chat_data) for chat_data in chats_data]
+
+            return _paginated(result, next_cursor)
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        return []
-    finally:
-        if 'conn' in locals():
-            conn.close()
+        return _paginated([], None)
 
 def get_last_interaction(jid: str) -> str:
     """Get most recent message involving the contact."""
     try:
-        conn = sqlite3.connect(MESSAGES_DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT messages.timestamp, messages.sender, messages.content,
-                   messages.is_from_me, chats.name as chat_name
-            FROM messages
-            LEFT JOIN chats ON messages.chat_jid = chats.jid
-            WHERE messages.sender = ? OR messages.chat_jid = ?
-            ORDER BY messages.timestamp DESC
-            LIMIT 1
-        """, (jid, jid))
-
-        msg_data = cursor.fetchone()
-        if not msg_data:
-            return f"No messages found for {jid}"
-
-        message = Message(
-            timestamp=datetime.fromisoformat(msg_data[0]),
-            sender=msg_data[1],
-            content=msg_data[2],
-            is_from_me=msg_data[3],
-            chat_name=msg_data[4],
-            chat_jid=jid,
-            id="",
-            media_type=None
-        )
-
-        return format_message(message, show_chat_info=True)
+        with get_conn() as conn:
+            cursor = conn.cursor()
+
+            # Newest message sent by the contact and newest in their chat,
+            # each an index seek, instead of an OR that scans every message
+            cursor.execute(f"""
+                SELECT latest.ts_epoch,
+                       latest.sender, latest.content, latest.is_from_me,
+                       chats.name as chat_name, ? AS chat_jid, '' AS id,
+                       NULL AS media_type
+                FROM (
+                    SELECT * FROM (
+                        SELECT {_TS_EPOCH} AS ts_epoch, sender, content, is_from_me, chat_jid
+                        FROM messages
+                        WHERE sender = ?
+                        ORDER BY {_TS_EPOCH} DESC
+                        LIMIT 1
+                    )
+                    UNION ALL
+                    SELECT * FROM (
+                        SELECT {_TS_EPOCH} AS ts_epoch, sender, content, is_from_me, chat_jid
+                        FROM messages
+                        WHERE chat_jid = ?
+                        ORDER BY {_TS_EPOCH} DESC
+                        LIMIT 1
+                    )
+                ) AS latest
+                LEFT JOIN chats ON latest.chat_jid = chats.jid
+                ORDER BY latest.ts_epoch DESC
+                LIMIT 1
+            """, (jid, jid, jid))
+
+            msg_data = cursor.fetchone()
+            if not msg_data:
+                return f"No messages found for {jid}"
+
+            message = _row_to_message(msg_data)
+
+            return format_message(message, show_chat_info=True)
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         return f"Error getting last interaction: {e}"
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 def get_chat(chat_jid: str, include_last_message: bool = True) -> Optional[Chat]:
     """Get chat metadata by JID."""
     try:
-        conn = sqlite3.connect(MESSAGES_DB_PATH)
-        cursor = conn.cursor()
+        with get_conn() as conn:
+            cursor = conn.cursor()
 
-        if include_last_message:
-            cursor.execute("""
-                SELECT jid, name, last_message_time, last_message, last_sender, last_is_from_me
-                FROM chats
-                WHERE jid = ?
-            """, (chat_jid,))
-        else:
-            cursor.execute("""
-                SELECT jid, name, last_message_time, NULL, NULL, NULL
-                FROM chats
-                WHERE jid = ?
-            """, (chat_jid,))
+            columns = _CHAT_COLUMNS if include_last_message else _CHAT_COLUMNS_WITHOUT_LAST
+            cursor.execute(f"SELECT {columns} FROM chats WHERE jid = ?", (chat_jid,))
 
-        chat_data = cursor.fetchone()
-        if not chat_data:
-            return None
+            chat_data = cursor.fetchone()
+            if not chat_data:
+                return None
 
-        return Chat(
-            jid=chat_data[0],
-            name=chat_data[1],
-            last_message_time=datetime.fromisoformat(chat_data[2]) if chat_data[2] else None,
-            last_message=chat_data[3],
-            last_sender=chat_data[4],
-            last_is_from_me=chat_data[5]
-        )
+            return _row_to_chat(chat_data)
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         return None
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 def get_direct_chat_by_contact(sender_phone_number: str) -> Optional[Chat]:
     """Get chat metadata by sender phone number."""
     try:
-        conn = sqlite3.connect(MESSAGES_DB_PATH)
-        cursor = conn.cursor()
-
-        # Find the chat JID for this contact
-        cursor.execute("""
-            SELECT DISTINCT chat_jid
-            FROM messages
-            WHERE sender = ? AND chat_jid LIKE '%@s.whatsapp.net'
-            LIMIT 1
-        """, (sender_phone_number,))
-
-        jid_result = cursor.fetchone()
-        if not jid_result:
-            return None
-
-        chat_jid = jid_result[0]
-
-        # Get chat metadata
-        cursor.execute("""
-            SELECT jid, name, last_message_time, last_message, last_sender, last_is_from_me
-            FROM chats
-            WHERE jid = ?
-        """, (chat_jid,))
+        with get_conn() as conn:
+            cursor = conn.cursor()
+
+            # Most recent direct chat the contact wrote in. The sender index
+            # yields their messages newest first, so the scan stops at the
+            # first one in a direct chat
+            cursor.execute(f"""
+                SELECT {_CHAT_COLUMNS}
+                FROM messages
+                JOIN chats ON messages.chat_jid = chats.jid
+                WHERE messages.sender = ? AND messages.chat_jid GLOB '*@s.whatsapp.net'
+                ORDER BY {_TS_EPOCH} DESC
+                LIMIT 1
+            """, (sender_phone_number,))
+
+            chat_data = cursor.fetchone()
+            if not chat_data:
+                return None
 
-        chat_data = cursor.fetchone()
-        if not chat_data:
-            return None
-
-        return Chat(
-            jid=chat_data[0],
-            name=chat_data[1],
-            last_message_time=datetime.fromisoformat(chat_data[2]) if chat_data[2] else None,
-            last_message=chat_data[3],
-            last_sender=chat_data[4],
-            last_is_from_me=chat_data[5]
-        )
+            return _row_to_chat(chat_data)
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         return None
-    finally:
-        if 'conn' in locals():
-            conn.close()
+
+def _post_json(
+    url: str,
+    payload: Dict[str, Any],
+    timeout: Tuple[float, float] = _REQUEST_TIMEOUT
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """POST a JSON payload to the bridge and decode its JSON reply.
+
+    Returns (result, "") on success, or (None, error message) when the
+    request fails, the status is not 200 or the body is not JSON. The body
+    is decoded from raw bytes, with orjson when installed.
+    """
+    try:
+        response = _SESSION.post(url, json=payload, timeout=timeout)
+    except requests.RequestException as e:
+        return None, f"Request error: {str(e)}"
+
+    if response.status_code != 200:
+        return None, f"Error: HTTP {response.status_code} - {response.text}"
+
+    try:
+        return _jloads(response.content), ""
+    except ValueError:
+        return None, f"Error parsing response: {response.text}"
 
 def send_message(recipient: str, message: str) -> Tuple[bool, str]:
     """Send a WhatsApp message via the bridge API."""
@@ -592,28 +1024,41 @@ def send_message(recipient: str, message: str) -> Tuple[bool, str]:
         if not recipient:
             return False, "Recipient must be provided"
 
-        url = f"{WHATSAPP_API_BASE_URL}/send"
+        url = _SEND_URL
         payload = {
             "recipient": recipient,
             "message": message,
         }
 
-        response = requests.post(url, json=payload)
-
-        # Check if the request was successful
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("success", False), result.get("message", "Unknown response")
-        else:
-            return False, f"Error: HTTP {response.status_code} - {response.text}"
+        result, error = _post_json(url, payload)
+        if result is None:
+            return False, error
+        return result.get("success", False), result.get("message", "Unknown response")
 
-    except requests.RequestException as e:
-        return False, f"Request error: {str(e)}"
-    except json.JSONDecodeError:
-        return False, f"Error parsing response: {response.text}"
     except Exception as e:
         return False, f"Unexpected error: {str(e)}"
 
+def _send_many(send: Callable[[str], Tuple[bool, str]], recipients: List[str]) -> List[Tuple[bool, str]]:
+    """Call ``send`` for every recipient concurrently, keeping their order.
+
+    Sends are independent, so a batch takes about as long as its slowest
+    request rather than the sum of all of them.
+    """
+    if not recipients:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(_SEND_WORKERS, len(recipients))) as executor:
+        return list(executor.map(send, recipients))
+
+def send_message_many(recipients: List[str], message: str) -> List[Tuple[bool, str]]:
+    """Send one text message to several recipients in parallel.
+
+    Returns a (success, message) result per recipient, in order. This is a
+    library helper for scripts importing this module; it is not exposed as
+    an MCP tool.
+    """
+    return _send_many(lambda recipient: send_message(recipient, message), recipients)
+
 def send_file(recipient: str, media_path: str) -> Tuple[bool, str]:
     """Send a file via WhatsApp."""
     try:
@@ -627,25 +1072,17 @@ def send_file(recipient: str, media_path: str) -> Tuple[bool, str]:
         if not os.path.isfile(media_path):
             return False, f"Media file not found: {media_path}"
 
-        url = f"{WHATSAPP_API_BASE_URL}/send"
+        url = _SEND_URL
         payload = {
             "recipient": recipient,
             "media_path": media_path
         }
 
-        response = requests.post(url, json=payload)
+        result, error = _post_json(url, payload)
+        if result is None:
+            return False, error
+        return result.get("success", False), result.get("message", "Unknown response")
 
-        # Check if the request was successful
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("success", False), result.get("message", "Unknown response")
-        else:
-            return False, f"Error: HTTP {response.status_code} - {response.text}"
-
-    except requests.RequestException as e:
-        return False, f"Request error: {str(e)}"
-    except json.JSONDecodeError:
-        return False, f"Error parsing response: {response.text}"
     except Exception as e:
         return False, f"Unexpected error: {str(e)}"
 
@@ -664,61 +1101,86 @@ def send_audio_message(recipient: str, media_path: str) -> Tuple[bool, str]:
 
         if not media_path.endswith(".ogg"):
             try:
-                media_path = audio.convert_to_opus_ogg_temp(media_path)
+                media_path = _convert_audio(media_path)
             except Exception as e:
                 return False, f"Error converting file to opus ogg. You likely need to install ffmpeg: {str(e)}"
 
-        url = f"{WHATSAPP_API_BASE_URL}/send"
+        url = _SEND_URL
         payload = {
             "recipient": recipient,
             "media_path": media_path
         }
 
-        response = requests.post(url, json=payload)
+        result, error = _post_json(url, payload)
+        if result is None:
+            return False, error
+        return result.get("success", False), result.get("message", "Unknown response")
 
-        # Check if the request was successful
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("success", False), result.get("message", "Unknown response")
-        else:
-            return False, f"Error: HTTP {response.status_code} - {response.text}"
-
-    except requests.RequestException as e:
-        return False, f"Request error: {str(e)}"
-    except json.JSONDecodeError:
-        return False, f"Error parsing response: {response.text}"
     except Exception as e:
         return False, f"Unexpected error: {str(e)}"
 
+@functools.lru_cache(maxsize=256)
+def _convert_audio_cached(path: str, mtime_ns: int, size: int) -> str:
+    """Convert one version of an audio file; see _convert_audio."""
+    return audio.convert_to_opus_ogg_temp(path)
+
+def _convert_audio(media_path: str) -> str:
+    """Convert an audio file to opus ogg, reusing earlier conversions.
+
+    Conversions are cached by path, modification time and size, so resending
+    an unchanged file skips ffmpeg.
+    """
+    path = os.path.abspath(media_path)
+    stat = os.stat(path)
+    converted = _convert_audio_cached(path, stat.st_mtime_ns, stat.st_size)
+    if not os.path.isfile(converted):
+        # The temporary output was cleaned up; convert again
+        _convert_audio_cached.cache_clear()
+        converted = _convert_audio_cached(path, stat.st_mtime_ns, stat.st_size)
+    return converted
+
+def send_audio_message_many(recipients: List[str], media_path: str) -> List[Tuple[bool, str]]:
+    """Send one audio file as a voice note to several recipients.
+
+    The file is converted once and the sends run in parallel. Returns a
+    (success, message) result per recipient, in order.
+    """
+    if not media_path:
+        return [(False, "Media path must be provided")] * len(recipients)
+
+    if not os.path.isfile(media_path):
+        return [(False, f"Media file not found: {media_path}")] * len(recipients)
+
+    if not media_path.endswith(".ogg"):
+        try:
+            media_path = _convert_audio(media_path)
+        except Exception as e:
+            error = f"Error converting file to opus ogg. You likely need to install ffmpeg: {str(e)}"
+            return [(False, error)] * len(recipients)
+
+    # Once converted, a voice note is sent exactly like a file
+    return _send_many(lambda recipient: send_file(recipient, media_path), recipients)
+
 def download_media(message_id: str, chat_jid: str) -> Optional[str]:
     """Download media from a WhatsApp message."""
     try:
-        url = f"{WHATSAPP_API_BASE_URL}/download"
+        url = _DOWNLOAD_URL
         payload = {
             "message_id": message_id,
             "chat_jid": chat_jid
         }
 
-        response = requests.post(url, json=payload)
+        result, error = _post_json(url, payload, _DOWNLOAD_TIMEOUT)
+        if result is None:
+            print(error)
+            return None
 
-        # Check if the request was successful
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("success", False):
-                return result.get("path")
-            else:
-                print(f"Download failed: {result.get('message', 'Unknown error')}")
-                return None
+        if result.get("success", False):
+            return result.get("path")
         else:
-            print(f"Error: HTTP {response.status_code} - {response.text}")
+            print(f"Download failed: {result.get('message', 'Unknown error')}")
             return None
 
-    except requests.RequestException as e:
-        print(f"Request error: {str(e)}")
-        return None
-    except json.JSONDecodeError:
-        print(f"Error parsing response: {response.text}")
-        return None
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
         return None